@@ -166,6 +166,31 @@ class AuditManager:
             
             conn.commit()
     
+    def bulk_insert(self, events: List[Dict[str, Any]]):
+        """Log a batch of audit events in a single transaction
+        
+        Each event carries the log_audit_event arguments plus an optional
+        timestamp of when the request was served.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany("""
+                INSERT INTO audit_logs 
+                (timestamp, user_id, api_key, request_data, response_data,
+                 processing_time, ip_address, user_agent, status_code,
+                 error_message, partner_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    event.get("timestamp", time.time()), event["user_id"], event["api_key"],
+                    json.dumps(event["request_data"]), json.dumps(event["response_data"]),
+                    event["processing_time"], event["ip_address"], event["user_agent"],
+                    event["status_code"], event.get("error_message"), event.get("partner_id")
+                )
+                for event in events
+            ])
+            
+            conn.commit()
+    
     def get_audit_logs(self, filters: AuditLogFilter, limit: int = 1000, 
                       offset: int = 0) -> List[AuditLogEntry]:
         """Get audit logs with filtering"""
@@ -28,6 +28,9 @@ API_KEYS = {
     "kifaa_admin_001": {"name": "Admin", "permissions": ["score_user", "logs", "retrain"]},
 }
 
+# Per-key user info with permissions as a frozenset, built on first use
+_api_key_users: Dict[str, Dict[str, Any]] = {}
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -105,18 +108,31 @@ async def get_current_user_api_key(credentials: HTTPAuthorizationCredentials = S
     
     return user_info
 
+def _with_permission_set(user_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy user info with permissions as a frozenset for O(1) checks"""
+    return {**user_info, "permissions": frozenset(user_info.get("permissions", ()))}
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security)) -> Dict[str, Any]:
-    """Get current user from either JWT token or API key"""
+    """
+    Get current user from either JWT token or API key
+    
+    The returned permissions are always a frozenset.
+    """
     token_or_key = credentials.credentials
     
     # Try JWT first
     payload = verify_token(token_or_key)
     if payload is not None:
-        return payload
+        return _with_permission_set(payload)
     
     # Try API key
+    user_info = _api_key_users.get(token_or_key)
+    if user_info is not None:
+        return user_info
+    
     user_info = verify_api_key(token_or_key)
     if user_info is not None:
+        user_info = _api_key_users[token_or_key] = _with_permission_set(user_info)
         return user_info
     
     raise HTTPException(
@@ -165,6 +181,7 @@ class AuthManager:
         api_key = ''.join(secrets.choice(alphabet) for _ in range(32))
         
         # Add to API keys (in production, save to database)
+        _api_key_users.pop(api_key, None)
         API_KEYS[api_key] = {
             "name": partner_name,
             "permissions": permissions,
@@ -180,6 +197,7 @@ class AuthManager:
         if api_key in API_KEYS:
             partner_name = API_KEYS[api_key]["name"]
             del API_KEYS[api_key]
+            _api_key_users.pop(api_key, None)
             logger.info(f"Revoked API key for partner: {partner_name}")
             return True
         return False
@@ -1,14 +1,52 @@
-import jwt
+import json
+import orjson
 import hashlib
 import secrets
+import threading
+import time
+from collections import Counter
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from functools import wraps
-from flask import request, jsonify, current_app
+from flask import request, jsonify, current_app, Response, g
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Number of lock-protected shards for per-identifier state (power of two)
+STATE_SHARDS = 16
+
+# Seconds between merges of pending usage statistics into api_keys
+USAGE_FLUSH_INTERVAL = 5
+
+# Constant denial bodies, encoded once instead of per rejected request
+_AUTH_REQUIRED_BODY = json.dumps({
+    "error": "Authentication required",
+    "message": "Valid API key or JWT token required"
+}).encode()
+_RATE_LIMITED_TEMPLATE = b'{"error": "Rate limit exceeded", "limit": %d, "retry_after": %d}'
+
+class ApiKeyRecord:
+    """API key metadata, returned as-is from verification without copying"""
+    
+    __slots__ = ('name', 'permissions', 'created_at', 'last_used', 'usage_count')
+    
+    def __init__(self, name: str, permissions: List[str]):
+        self.name = name
+        self.permissions = permissions
+        self.created_at = datetime.utcnow().isoformat()
+        self.last_used = None
+        self.usage_count = 0
+    
+    def get(self, field: str, default: Any = None) -> Any:
+        """Dict-style access so records and JWT payloads read the same way"""
+        return getattr(self, field, default)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert record to a JSON-serializable dict"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
 class JWTAuthManager:
     """JWT Authentication Manager for Kifaa API"""
     
@@ -17,33 +55,48 @@ class JWTAuthManager:
         self.algorithm = algorithm
         self.token_expiry_hours = 24
         
+        # Reuse one configured codec instead of re-normalizing options per
+        # call; built on first use so importing this module stays cheap
+        self._jwt = None
+        self._algorithms = [self.algorithm]
+        
         # In production, store these in a database
         self.api_keys = {
-            "kifaa_admin_001": {
-                "name": "Admin Key",
-                "permissions": ["score_user", "logs", "retrain", "admin"],
-                "created_at": datetime.utcnow().isoformat(),
-                "last_used": None,
-                "usage_count": 0
-            },
-            "kifaa_partner_001": {
-                "name": "Partner Key 1",
-                "permissions": ["score_user"],
-                "created_at": datetime.utcnow().isoformat(),
-                "last_used": None,
-                "usage_count": 0
-            },
-            "kifaa_ussd_001": {
-                "name": "USSD Gateway",
-                "permissions": ["score_user"],
-                "created_at": datetime.utcnow().isoformat(),
-                "last_used": None,
-                "usage_count": 0
-            }
+            "kifaa_admin_001": ApiKeyRecord("Admin Key", ["score_user", "logs", "retrain", "admin"]),
+            "kifaa_partner_001": ApiKeyRecord("Partner Key 1", ["score_user"]),
+            "kifaa_ussd_001": ApiKeyRecord("USSD Gateway", ["score_user"])
         }
         
-        # Rate limiting storage (in production, use Redis)
-        self.rate_limits = {}
+        # Rate limiting storage (in production, use Redis), sharded so that
+        # concurrent requests for different identifiers never share a lock
+        self._shards = [(threading.Lock(), {}) for _ in range(STATE_SHARDS)]
+        
+        # Short-lived cache of verified token payloads keyed by token digest
+        self._verify_cache = TTLCache(maxsize=10000, ttl=5)
+        self._verify_cache_lock = threading.Lock()
+        self._cache_hash_key = self.secret_key.encode()[:64]
+        
+        # Usage statistics accumulated off the request path and merged
+        # into api_keys periodically
+        self._pending_usage = Counter()
+        self._last_used_ts = {}
+        self._usage_lock = threading.Lock()
+        self._usage_stop = threading.Event()
+        self._usage_thread = threading.Thread(
+            target=self._run_usage_flush, name="api-key-usage-flush", daemon=True
+        )
+        self._usage_thread.start()
+    
+    def _get_codec(self):
+        """Return the shared PyJWT codec, importing PyJWT on first use"""
+        if self._jwt is None:
+            import jwt
+            self._jwt = jwt.PyJWT(options={
+                "verify_signature": True,
+                "verify_exp": True,
+                "require": ["exp", "iat", "api_key"]
+            })
+        return self._jwt
     
     def generate_jwt_token(self, api_key: str, additional_claims: Dict[str, Any] = None) -> Optional[str]:
         """Generate JWT token for valid API key"""
@@ -52,15 +105,13 @@ class JWTAuthManager:
         
         key_info = self.api_keys[api_key]
         
-        # Update usage statistics
-        key_info["last_used"] = datetime.utcnow().isoformat()
-        key_info["usage_count"] += 1
+        self._record_usage(api_key)
         
         # Create JWT payload
         payload = {
             "api_key": api_key,
-            "name": key_info["name"],
-            "permissions": key_info["permissions"],
+            "name": key_info.name,
+            "permissions": key_info.permissions,
             "iat": datetime.utcnow(),
             "exp": datetime.utcnow() + timedelta(hours=self.token_expiry_hours),
             "iss": "kifaa-api",
@@ -71,8 +122,8 @@ class JWTAuthManager:
             payload.update(additional_claims)
         
         try:
-            token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
-            logger.info(f"JWT token generated for {key_info['name']}")
+            token = self._get_codec().encode(payload, self.secret_key, algorithm=self.algorithm)
+            logger.info(f"JWT token generated for {key_info.name}")
             return token
         except Exception as e:
             logger.error(f"Failed to generate JWT token: {str(e)}")
@@ -80,8 +131,17 @@ class JWTAuthManager:
     
     def verify_jwt_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify and decode JWT token"""
+        # Keyed digest binds cache entries to the signing key
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16, key=self._cache_hash_key).digest()
+        with self._verify_cache_lock:
+            cached = self._verify_cache.get(cache_key)
+        if cached is not None and cached["exp"] > time.time():
+            return cached
+        
+        import jwt
+        
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = self._get_codec().decode(token, self.secret_key, algorithms=self._algorithms)
             
             # Verify API key still exists and is valid
             api_key = payload.get("api_key")
@@ -89,6 +149,8 @@ class JWTAuthManager:
                 logger.warning(f"JWT token contains invalid API key: {api_key}")
                 return None
             
+            with self._verify_cache_lock:
+                self._verify_cache[cache_key] = payload
             return payload
             
         except jwt.ExpiredSignatureError:
@@ -101,30 +163,19 @@ class JWTAuthManager:
             logger.error(f"JWT verification error: {str(e)}")
             return None
     
-    def verify_api_key(self, api_key: str) -> Optional[Dict[str, Any]]:
+    def verify_api_key(self, api_key: str) -> Optional[ApiKeyRecord]:
         """Verify API key directly (fallback method)"""
-        if api_key in self.api_keys:
-            key_info = self.api_keys[api_key].copy()
-            
-            # Update usage statistics
-            self.api_keys[api_key]["last_used"] = datetime.utcnow().isoformat()
-            self.api_keys[api_key]["usage_count"] += 1
-            
-            return key_info
-        return None
+        key_info = self.api_keys.get(api_key)
+        if key_info is not None:
+            self._record_usage(api_key)
+        return key_info
     
     def create_api_key(self, partner_name: str, permissions: List[str]) -> str:
         """Create new API key"""
         # Generate secure API key
-        api_key = f"kifaa_{hashlib.md5(partner_name.encode()).hexdigest()[:8]}_{secrets.token_urlsafe(8)}"
+        api_key = f"kifaa_{hashlib.blake2b(partner_name.encode(), digest_size=4).hexdigest()}_{secrets.token_urlsafe(8)}"
         
-        self.api_keys[api_key] = {
-            "name": partner_name,
-            "permissions": permissions,
-            "created_at": datetime.utcnow().isoformat(),
-            "last_used": None,
-            "usage_count": 0
-        }
+        self.api_keys[api_key] = ApiKeyRecord(partner_name, permissions)
         
         logger.info(f"Created new API key for {partner_name}")
         return api_key
@@ -133,38 +184,95 @@ class JWTAuthManager:
         """Revoke API key"""
         if api_key in self.api_keys:
             del self.api_keys[api_key]
+            
+            # Drop cached token payloads issued for the revoked key
+            with self._verify_cache_lock:
+                stale = [k for k, payload in self._verify_cache.items()
+                         if payload.get("api_key") == api_key]
+                for k in stale:
+                    self._verify_cache.pop(k, None)
+            
             logger.info(f"Revoked API key: {api_key}")
             return True
         return False
     
-    def check_rate_limit(self, identifier: str, limit: int = 100, window_minutes: int = 60) -> Dict[str, Any]:
-        """Check rate limit for identifier (API key or IP)"""
-        now = datetime.utcnow()
-        window_start = now - timedelta(minutes=window_minutes)
+    def _record_usage(self, api_key: str):
+        """Record a use of an API key without touching api_keys"""
+        with self._usage_lock:
+            self._pending_usage[api_key] += 1
+            self._last_used_ts[api_key] = time.time()
+    
+    def flush_usage(self):
+        """Merge pending usage statistics into api_keys"""
+        with self._usage_lock:
+            pending, self._pending_usage = self._pending_usage, Counter()
+            last_used, self._last_used_ts = self._last_used_ts, {}
         
-        if identifier not in self.rate_limits:
-            self.rate_limits[identifier] = []
+        for api_key, count in pending.items():
+            key_info = self.api_keys.get(api_key)
+            if key_info is None:
+                continue
+            key_info.usage_count += count
+            key_info.last_used = datetime.utcfromtimestamp(last_used[api_key]).isoformat()
+    
+    def _run_usage_flush(self):
+        """Flush usage every USAGE_FLUSH_INTERVAL seconds until close()"""
+        while not self._usage_stop.wait(USAGE_FLUSH_INTERVAL):
+            try:
+                self.flush_usage()
+            except Exception as e:
+                logger.error(f"Failed to flush API key usage: {str(e)}")
+    
+    def close(self):
+        """Stop the background usage flush and merge what is still pending"""
+        self._usage_stop.set()
+        self._usage_thread.join()
+        self.flush_usage()
+    
+    def _shard(self, identifier: str):
+        """Return the (lock, state) shard owning an identifier"""
+        return self._shards[hash(identifier) & (STATE_SHARDS - 1)]
+    
+    def check_rate_limit(self, identifier: str, limit: int = 100, window_minutes: int = 60) -> Dict[str, Any]:
+        """Check rate limit for identifier (API key or IP)
         
-        # Clean old requests
-        self.rate_limits[identifier] = [
-            req_time for req_time in self.rate_limits[identifier]
-            if req_time > window_start
-        ]
+        Uses a two-bucket sliding window: the previous window's count is
+        weighted by how much of it still overlaps the sliding window, so each
+        check is a few integer operations instead of a scan of timestamps.
+        """
+        window = window_minutes * 60
+        now = time.time()
+        bucket = int(now // window)
         
-        current_count = len(self.rate_limits[identifier])
+        # State is [bucket, previous_count, current_count]
+        lock, rate_limits = self._shard(identifier)
+        with lock:
+            state = rate_limits.get(identifier)
+            if state is None:
+                state = rate_limits[identifier] = [bucket, 0, 0]
+            elif state[0] != bucket:
+                state[1] = state[2] if state[0] == bucket - 1 else 0
+                state[2] = 0
+                state[0] = bucket
+            
+            elapsed = now - bucket * window
+            weighted_count = state[1] * (window - elapsed) / window + state[2]
+            current_count = int(weighted_count)
+            
+            if weighted_count < limit:
+                # Add current request
+                state[2] += 1
         
-        if current_count >= limit:
+        if weighted_count >= limit:
+            reset_at = (bucket + 1) * window
             return {
                 "allowed": False,
                 "current_count": current_count,
                 "limit": limit,
-                "reset_time": (window_start + timedelta(minutes=window_minutes)).isoformat(),
-                "retry_after": window_minutes * 60
+                "reset_time": datetime.utcfromtimestamp(reset_at).isoformat(),
+                "retry_after": int(reset_at - now) + 1
             }
         
-        # Add current request
-        self.rate_limits[identifier].append(now)
-        
         return {
             "allowed": True,
             "current_count": current_count + 1,
@@ -177,18 +285,22 @@ auth_manager = JWTAuthManager()
 
 def require_auth(permissions: List[str] = None):
     """Decorator to require authentication and optionally specific permissions"""
+    required_permissions = frozenset(permissions) if permissions else None
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             # Get token from Authorization header or API key
-            auth_header = request.headers.get('Authorization', '')
+            auth_header = request.headers.get('Authorization')
             api_key = None
             token = None
             
-            if auth_header.startswith('Bearer '):
-                token = auth_header[7:]  # Remove 'Bearer ' prefix
-            elif auth_header.startswith('ApiKey '):
-                api_key = auth_header[7:]  # Remove 'ApiKey ' prefix
+            # Both schemes have a 7-character prefix
+            scheme = auth_header[:7] if auth_header else None
+            if scheme == 'Bearer ':
+                token = auth_header[7:]
+            elif scheme == 'ApiKey ':
+                api_key = auth_header[7:]
             else:
                 # Check for API key in query params (less secure, for testing)
                 api_key = request.args.get('api_key')
@@ -202,15 +314,12 @@ def require_auth(permissions: List[str] = None):
                 user_info = auth_manager.verify_api_key(api_key)
             
             if not user_info:
-                return jsonify({
-                    "error": "Authentication required",
-                    "message": "Valid API key or JWT token required"
-                }), 401
+                return Response(_AUTH_REQUIRED_BODY, status=401, mimetype='application/json')
             
             # Check permissions
-            if permissions:
+            if required_permissions:
                 user_permissions = user_info.get("permissions", [])
-                if not any(perm in user_permissions for perm in permissions):
+                if required_permissions.isdisjoint(user_permissions):
                     return jsonify({
                         "error": "Insufficient permissions",
                         "required": permissions,
@@ -222,14 +331,12 @@ def require_auth(permissions: List[str] = None):
             rate_limit_result = auth_manager.check_rate_limit(identifier)
             
             if not rate_limit_result["allowed"]:
-                return jsonify({
-                    "error": "Rate limit exceeded",
-                    "limit": rate_limit_result["limit"],
-                    "retry_after": rate_limit_result["retry_after"]
-                }), 429
+                body = _RATE_LIMITED_TEMPLATE % (rate_limit_result["limit"], rate_limit_result["retry_after"])
+                return Response(body, status=429, mimetype='application/json')
             
             # Add user info to request context
             request.user_info = user_info
+            g.user_info = user_info
             request.rate_limit_info = rate_limit_result
             
             return f(*args, **kwargs)
@@ -249,6 +356,14 @@ def get_rate_limit_info() -> Optional[Dict[str, Any]]:
     """Get current request rate limit info"""
     return getattr(request, 'rate_limit_info', None)
 
+def _parse_json_body() -> Optional[Dict[str, Any]]:
+    """Parse a small JSON request body with orjson, or None if malformed"""
+    try:
+        data = orjson.loads(request.get_data() or b'{}')
+    except orjson.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
 # Flask routes for authentication management
 def setup_auth_routes(app):
     """Setup authentication routes"""
@@ -256,7 +371,10 @@ def setup_auth_routes(app):
     @app.route('/auth/token', methods=['POST'])
     def generate_token():
         """Generate JWT token from API key"""
-        data = request.get_json()
+        data = _parse_json_body()
+        if data is None:
+            return jsonify({"error": "Invalid JSON body"}), 400
+        
         api_key = data.get('api_key')
         
         if not api_key:
@@ -276,7 +394,10 @@ def setup_auth_routes(app):
     @require_admin()
     def create_api_key():
         """Create new API key (admin only)"""
-        data = request.get_json()
+        data = _parse_json_body()
+        if data is None:
+            return jsonify({"error": "Invalid JSON body"}), 400
+        
         partner_name = data.get('partner_name')
         permissions = data.get('permissions', ['score_user'])
         
@@ -294,8 +415,9 @@ def setup_auth_routes(app):
     @require_admin()
     def list_api_keys():
         """List all API keys (admin only)"""
+        auth_manager.flush_usage()
         return jsonify({
-            "api_keys": auth_manager.api_keys
+            "api_keys": {key: record.to_dict() for key, record in auth_manager.api_keys.items()}
         })
     
     @app.route('/auth/api-key/<api_key>', methods=['DELETE'])
@@ -314,6 +436,9 @@ def setup_auth_routes(app):
         user_info = get_current_user()
         rate_limit_info = get_rate_limit_info()
         
+        if isinstance(user_info, ApiKeyRecord):
+            user_info = user_info.to_dict()
+        
         return jsonify({
             "user": user_info,
             "rate_limit": rate_limit_info
@@ -1,13 +1,54 @@
 import logging
 import logging.handlers
 import os
-import json
 import sys
+import gzip
+import queue
+import atexit
+import threading
+import time
+import orjson
 from datetime import datetime
 from typing import Dict, Any, Optional
-import requests
 from pathlib import Path
 
+# Multi-process safe rotation when available (e.g. several gunicorn workers)
+try:
+    from concurrent_log_handler import ConcurrentRotatingFileHandler as RotatingFileHandler
+except ImportError:
+    RotatingFileHandler = logging.handlers.RotatingFileHandler
+
+# LogRecord attributes that are not emitted as extra fields in JSON logs
+_STD_ATTRS = frozenset([
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
+    'filename', 'module', 'lineno', 'funcName', 'created',
+    'msecs', 'relativeCreated', 'thread', 'threadName',
+    'processName', 'process', 'getMessage', 'exc_info', 'exc_text', 'stack_info'
+])
+
+def _tail_lines(path: Path, lines: int, block_size: int = 65536) -> list:
+    """Return the last N lines of a file as bytes, reading backwards from EOF"""
+    with open(path, 'rb') as f:
+        if lines <= 0:
+            return f.read().splitlines()
+        
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        chunks = []
+        newlines = 0
+        
+        # One extra newline guarantees the oldest kept line is complete
+        while position > 0 and newlines <= lines:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+    
+    chunks.reverse()
+    return b''.join(chunks).splitlines()[-lines:]
+
 class KifaaFormatter(logging.Formatter):
     """Custom formatter for Kifaa logs with JSON output option"""
     
@@ -24,7 +65,8 @@ class KifaaFormatter(logging.Formatter):
     def format(self, record):
         if self.json_format:
             log_entry = {
-                'timestamp': datetime.fromtimestamp(record.created).isoformat(),
+                # orjson renders datetimes natively in ISO 8601
+                'timestamp': datetime.fromtimestamp(record.created),
                 'level': record.levelname,
                 'logger': record.name,
                 'message': record.getMessage(),
@@ -37,15 +79,12 @@ class KifaaFormatter(logging.Formatter):
             if record.exc_info:
                 log_entry['exception'] = self.formatException(record.exc_info)
             
-            # Add extra fields
+            # Add extra fields, in the order they were set on the record
             for key, value in record.__dict__.items():
-                if key not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 
-                              'filename', 'module', 'lineno', 'funcName', 'created', 
-                              'msecs', 'relativeCreated', 'thread', 'threadName', 
-                              'processName', 'process', 'getMessage', 'exc_info', 'exc_text', 'stack_info']:
+                if key not in _STD_ATTRS:
                     log_entry[key] = value
             
-            return json.dumps(log_entry)
+            return orjson.dumps(log_entry, default=str).decode()
         else:
             return super().format(record)
 
@@ -56,6 +95,9 @@ class RemoteLogHandler(logging.Handler):
         super().__init__()
         self.service_type = service_type
         self.config = config
+        
+        # Imported here so processes without remote logging never load requests
+        import requests
         self.session = requests.Session()
         
         # Set timeout for remote requests
@@ -64,6 +106,13 @@ class RemoteLogHandler(logging.Handler):
         # Buffer for batch sending
         self.buffer = []
         self.buffer_size = config.get('buffer_size', 10)
+        
+        # Longest a partial batch may wait before being sent
+        self.max_latency = config.get('max_latency_seconds', 1)
+        self._flush_timer = None
+        
+        # S3 client, created on first flush and reused afterwards
+        self._s3 = None
     
     def emit(self, record):
         """Emit log record to remote service"""
@@ -82,23 +131,51 @@ class RemoteLogHandler(logging.Handler):
             print(f"Failed to send log to remote service: {e}", file=sys.stderr)
     
     def _send_to_loggly(self, log_entry: str):
-        """Send log to Loggly"""
-        token = self.config.get('token')
-        if not token:
+        """Buffer log for batch sending to Loggly"""
+        if not self.config.get('token'):
+            return
+        
+        self.buffer.append(log_entry)
+        
+        if len(self.buffer) >= self.buffer_size:
+            self._flush_to_loggly()
+        elif self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.max_latency, self._timed_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _timed_flush(self):
+        """Flush a partial Loggly batch once max latency has elapsed"""
+        self.acquire()
+        try:
+            self._flush_timer = None
+            self._flush_to_loggly()
+        finally:
+            self.release()
+    
+    def _flush_to_loggly(self):
+        """Send buffered logs to Loggly's bulk endpoint"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        
+        if not self.buffer:
             return
         
-        url = f"https://logs-01.loggly.com/inputs/{token}/tag/kifaa-api/"
+        url = f"https://logs-01.loggly.com/bulk/{self.config['token']}/tag/kifaa-api/"
         
         try:
             response = self.session.post(
                 url,
-                data=log_entry,
+                data='\n'.join(self.buffer),
                 headers={'Content-Type': 'application/json'},
                 timeout=self.timeout
             )
             response.raise_for_status()
         except Exception as e:
             print(f"Failed to send to Loggly: {e}", file=sys.stderr)
+        finally:
+            self.buffer.clear()
     
     def _buffer_for_s3(self, log_entry: str):
         """Buffer logs for batch upload to S3"""
@@ -113,25 +190,19 @@ class RemoteLogHandler(logging.Handler):
             return
         
         try:
-            import boto3
+            s3_client = self._get_s3_client()
             
-            s3_client = boto3.client(
-                's3',
-                aws_access_key_id=self.config.get('access_key'),
-                aws_secret_access_key=self.config.get('secret_key'),
-                region_name=self.config.get('region', 'us-east-1')
-            )
-            
-            # Create log file content
-            log_content = '\n'.join(self.buffer)
+            # Create log file content; JSON lines compress well even at level 1
+            log_content = gzip.compress('\n'.join(self.buffer).encode(), compresslevel=1)
             timestamp = datetime.utcnow().strftime('%Y/%m/%d/%H')
-            key = f"kifaa-logs/{timestamp}/logs-{datetime.utcnow().isoformat()}.json"
+            key = f"kifaa-logs/{timestamp}/logs-{datetime.utcnow().isoformat()}.json.gz"
             
             s3_client.put_object(
                 Bucket=self.config['bucket'],
                 Key=key,
                 Body=log_content,
-                ContentType='application/json'
+                ContentType='application/json',
+                ContentEncoding='gzip'
             )
             
             self.buffer.clear()
@@ -139,6 +210,22 @@ class RemoteLogHandler(logging.Handler):
         except Exception as e:
             print(f"Failed to upload to S3: {e}", file=sys.stderr)
     
+    def _get_s3_client(self):
+        """Return the cached S3 client, creating it on first use"""
+        if self._s3 is None:
+            import boto3
+            from botocore.config import Config
+            
+            self._s3 = boto3.client(
+                's3',
+                aws_access_key_id=self.config.get('access_key'),
+                aws_secret_access_key=self.config.get('secret_key'),
+                region_name=self.config.get('region', 'us-east-1'),
+                # Keep connections to S3 pooled for repeated uploads
+                config=Config(max_pool_connections=10)
+            )
+        return self._s3
+    
     def _send_to_webhook(self, log_entry: str):
         """Send log to webhook URL"""
         webhook_url = self.config.get('url')
@@ -158,7 +245,9 @@ class RemoteLogHandler(logging.Handler):
     
     def close(self):
         """Close handler and flush any remaining logs"""
-        if self.service_type == 's3':
+        if self.service_type == 'loggly':
+            self._flush_to_loggly()
+        elif self.service_type == 's3':
             self._flush_to_s3()
         super().close()
 
@@ -179,6 +268,7 @@ class LoggingManager:
         }
         
         self.configured = False
+        self.remote_listener = None
     
     def setup_logging(self, config: Dict[str, Any] = None):
         """Setup comprehensive logging configuration"""
@@ -215,19 +305,21 @@ class LoggingManager:
     def _setup_file_handlers(self, config: Dict[str, Any]):
         """Setup file-based log handlers"""
         # Main application log (rotating)
-        main_handler = logging.handlers.RotatingFileHandler(
+        main_handler = RotatingFileHandler(
             self.log_files['main'],
             maxBytes=config.get('max_file_size', 10 * 1024 * 1024),  # 10MB
-            backupCount=config.get('backup_count', 5)
+            backupCount=config.get('backup_count', 5),
+            delay=True
         )
         main_handler.setLevel(logging.INFO)
         main_handler.setFormatter(KifaaFormatter(json_format=config.get('json_logs', False)))
         
         # Error log (rotating)
-        error_handler = logging.handlers.RotatingFileHandler(
+        error_handler = RotatingFileHandler(
             self.log_files['error'],
             maxBytes=config.get('max_file_size', 10 * 1024 * 1024),
-            backupCount=config.get('backup_count', 5)
+            backupCount=config.get('backup_count', 5),
+            delay=True
         )
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(KifaaFormatter(json_format=config.get('json_logs', False)))
@@ -242,45 +334,76 @@ class LoggingManager:
                 self.log_dir / f"{self.app_name}_daily.log",
                 when='midnight',
                 interval=1,
-                backupCount=config.get('daily_backup_count', 30)
+                backupCount=config.get('daily_backup_count', 30),
+                delay=True
             )
             daily_handler.setLevel(logging.INFO)
             daily_handler.setFormatter(KifaaFormatter(json_format=config.get('json_logs', False)))
             logging.getLogger().addHandler(daily_handler)
     
     def _setup_remote_handlers(self, config: Dict[str, Any]):
-        """Setup remote log handlers"""
+        """Setup remote log handlers
+        
+        Remote handlers perform network I/O, so they are driven by a
+        QueueListener thread; request threads only enqueue records.
+        """
         remote_config = config.get('remote_logging', {})
+        remote_handlers = []
         
         # Loggly integration
         if remote_config.get('loggly', {}).get('enabled', False):
             loggly_handler = RemoteLogHandler('loggly', remote_config['loggly'])
             loggly_handler.setLevel(logging.WARNING)  # Only send warnings and errors
             loggly_handler.setFormatter(KifaaFormatter(json_format=True))
-            logging.getLogger().addHandler(loggly_handler)
+            remote_handlers.append(loggly_handler)
         
         # S3 integration
         if remote_config.get('s3', {}).get('enabled', False):
             s3_handler = RemoteLogHandler('s3', remote_config['s3'])
             s3_handler.setLevel(logging.INFO)
             s3_handler.setFormatter(KifaaFormatter(json_format=True))
-            logging.getLogger().addHandler(s3_handler)
+            remote_handlers.append(s3_handler)
         
         # Webhook integration
         if remote_config.get('webhook', {}).get('enabled', False):
             webhook_handler = RemoteLogHandler('webhook', remote_config['webhook'])
             webhook_handler.setLevel(logging.ERROR)  # Only send errors
             webhook_handler.setFormatter(KifaaFormatter(json_format=True))
-            logging.getLogger().addHandler(webhook_handler)
+            remote_handlers.append(webhook_handler)
+        
+        if not remote_handlers:
+            return
+        
+        log_queue = queue.Queue(-1)
+        self.remote_listener = logging.handlers.QueueListener(
+            log_queue, *remote_handlers, respect_handler_level=True
+        )
+        self.remote_listener.start()
+        atexit.register(self.shutdown)
+        
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(min(h.level for h in remote_handlers))
+        logging.getLogger().addHandler(queue_handler)
+    
+    def shutdown(self):
+        """Drain queued remote log records and close remote handlers"""
+        if self.remote_listener is None:
+            return
+        
+        listener, self.remote_listener = self.remote_listener, None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
     
     def _setup_app_loggers(self):
         """Setup application-specific loggers"""
         # Access logger for API requests
         access_logger = logging.getLogger('kifaa.access')
-        access_handler = logging.handlers.RotatingFileHandler(
+        access_handler = RotatingFileHandler(
             self.log_files['access'],
             maxBytes=10 * 1024 * 1024,
-            backupCount=5
+            backupCount=5,
+            delay=True
         )
         access_handler.setFormatter(KifaaFormatter(json_format=True))
         access_logger.addHandler(access_handler)
@@ -289,10 +412,11 @@ class LoggingManager:
         
         # Security logger for authentication events
         security_logger = logging.getLogger('kifaa.security')
-        security_handler = logging.handlers.RotatingFileHandler(
+        security_handler = RotatingFileHandler(
             self.log_files['security'],
             maxBytes=10 * 1024 * 1024,
-            backupCount=10
+            backupCount=10,
+            delay=True
         )
         security_handler.setFormatter(KifaaFormatter(json_format=True))
         security_logger.addHandler(security_handler)
@@ -306,21 +430,15 @@ class LoggingManager:
             return []
         
         try:
-            with open(log_file, 'r') as f:
-                all_lines = f.readlines()
-            
             # Get last N lines
-            recent_lines = all_lines[-lines:] if lines > 0 else all_lines
+            recent_lines = _tail_lines(log_file, lines)
             
-            # Filter by level if specified
+            # Filter by level if specified, before paying for decoding
             if level:
-                filtered_lines = []
-                for line in recent_lines:
-                    if level.upper() in line:
-                        filtered_lines.append(line.strip())
-                return filtered_lines
+                level_bytes = level.upper().encode()
+                recent_lines = [line for line in recent_lines if level_bytes in line]
             
-            return [line.strip() for line in recent_lines]
+            return [line.strip().decode('utf-8', errors='replace') for line in recent_lines]
             
         except Exception as e:
             logging.error(f"Failed to read log file {log_file}: {e}")
@@ -355,39 +473,53 @@ logging_manager = LoggingManager()
 
 def setup_flask_logging(app, config: Dict[str, Any] = None):
     """Setup logging for Flask application"""
+    from flask import request, g
+    
     logging_manager.setup_logging(config)
     
+    access_logger = logging.getLogger('kifaa.access')
+    
     # Add request logging middleware
     @app.before_request
     def log_request():
         """Log incoming requests"""
-        from flask import request
+        if not access_logger.isEnabledFor(logging.INFO):
+            return
         
-        request_data = {
+        g.request_start = time.perf_counter()
+        
+        logging_manager.log_api_request({
             'method': request.method,
             'url': request.url,
             'remote_addr': request.remote_addr,
             'user_agent': request.headers.get('User-Agent', ''),
             'content_length': request.content_length,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        
-        # Add user info if available
-        if hasattr(request, 'user_info') and request.user_info:
-            request_data['user'] = request.user_info.get('name', 'unknown')
-            request_data['api_key'] = request.user_info.get('api_key', 'unknown')
-        
-        logging_manager.log_api_request(request_data)
+            'timestamp': time.time()
+        })
     
     @app.after_request
     def log_response(response):
         """Log response details"""
-        access_logger = logging.getLogger('kifaa.access')
-        access_logger.info("API response", extra={
+        if not access_logger.isEnabledFor(logging.INFO):
+            return response
+        
+        response_data = {
             'status_code': response.status_code,
             'content_length': response.content_length,
-            'timestamp': datetime.utcnow().isoformat()
-        })
+            'timestamp': time.time()
+        }
+        
+        request_start = g.get('request_start')
+        if request_start is not None:
+            response_data['duration_ms'] = (time.perf_counter() - request_start) * 1000
+        
+        # Add user info if the request was authenticated
+        user_info = g.get('user_info')
+        if user_info:
+            response_data['user'] = user_info.get('name', 'unknown')
+            response_data['api_key'] = user_info.get('api_key', 'unknown')
+        
+        access_logger.info("API response", extra=response_data)
         return response
 
 def get_logging_config():
@@ -402,7 +534,9 @@ def get_logging_config():
             'loggly': {
                 'enabled': False,
                 'token': os.getenv('LOGGLY_TOKEN'),
-                'timeout': 10
+                'timeout': 10,
+                'buffer_size': 50,
+                'max_latency_seconds': 1
             },
             's3': {
                 'enabled': False,
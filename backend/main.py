@@ -1,9 +1,10 @@
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Dict, Any
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 class UserProfile(BaseModel):
     user_id: str
@@ -12,16 +13,19 @@ class UserProfile(BaseModel):
     credit_history_length: int
     # Add more relevant fields as per the actual model
 
+# Constant explanation shared by every response
+_EXPLANATION = {"reason": "Dummy explanation based on income, credit history, and age"}
+
 @app.post("/score-user")
-async def score_user(profile: UserProfile) -> Dict[str, Any]:
+def score_user(profile: UserProfile) -> Dict[str, Any]:
     # Placeholder for actual scoring logic
     # This will be replaced by a call to credit_scoring.py
     try:
         score = profile.income / 1000 + profile.credit_history_length * 10 - profile.age # Dummy scoring logic
-        explanation = {"reason": "Dummy explanation based on income, credit history, and age"}
-        return {"user_id": profile.user_id, "score": score, "explanation": explanation}
+        return {"user_id": profile.user_id, "score": score, "explanation": _EXPLANATION}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Scoring failed: {str(e)}")
 
-
-
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
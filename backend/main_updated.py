@@ -1,16 +1,18 @@
 from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
 from typing import Dict, Any, List, Optional
 import logging
 import os
+import time
+from collections import deque
 from datetime import datetime
 import json
 
 # Import our modules
 from credit_scoring import CreditScorer
-from utils import explain_score, validate_user_data, format_api_response
+from utils import explain_score, format_api_response
 from auth import get_current_user, require_score_permission, require_admin_permission, AuthManager
 from rate_limiter import rate_limiter, add_rate_limit_headers, custom_rate_limit
 
@@ -25,13 +27,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _tail_log_lines(path: str, lines: int, needle: Optional[bytes] = None,
+                    block_size: int = 65536):
+    """
+    Read the last N lines containing needle by scanning backwards from EOF
+    
+    Returns the matching lines as bytes and an estimate of how many lines
+    match in the whole file, extrapolated from the portion scanned.
+    """
+    matched = deque()
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        file_size = position = f.tell()
+        remainder = b''
+        scanned = 0
+        
+        while position > 0 and (lines <= 0 or len(matched) < lines):
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            parts = (f.read(read_size) + remainder).split(b'\n')
+            
+            # The first piece may continue into the previous block
+            remainder = parts.pop(0) if position > 0 else b''
+            
+            for line in reversed(parts):
+                scanned += len(line) + 1
+                if line.strip() and (needle is None or needle in line):
+                    matched.appendleft(line)
+                    if len(matched) == lines:
+                        break
+    
+    if position == 0 and len(matched) != lines:
+        return list(matched), len(matched)
+    return list(matched), int(len(matched) * file_size / max(scanned, 1))
+
 # Create FastAPI app
 app = FastAPI(
     title="Kifaa Credit Scoring API",
     description="AI-powered asset financing platform for the underbanked",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -46,11 +84,25 @@ app.add_middleware(
 # Initialize credit scorer
 scorer = CreditScorer()
 
+# Accepted (min, max, default) for optional scoring inputs; out-of-range
+# values fall back to the default instead of failing the request
+OPTIONAL_FIELD_RANGES = {
+    'credit_history_length': (0, 50, 5),
+    'debt_to_income_ratio': (0, 1, 0.3),
+    'employment_length': (0, 50, 2),
+    'number_of_accounts': (0, 50, 3),
+    'payment_history_score': (0, 1, 0.8),
+    'credit_utilization': (0, 1, 0.3),
+    'recent_inquiries': (0, 20, 1)
+}
+
+VALID_REGIONS = frozenset(['urban', 'rural', 'suburban'])
+
 # Pydantic models
 class UserProfile(BaseModel):
     user_id: str = Field(..., description="Unique user identifier")
     age: float = Field(..., ge=18, le=100, description="User age in years")
-    income: float = Field(..., ge=0, description="Annual income in local currency")
+    income: float = Field(..., ge=0, le=10000000, description="Annual income in local currency")
     credit_history_length: float = Field(..., ge=0, description="Credit history length in years")
     debt_to_income_ratio: Optional[float] = Field(0.3, ge=0, le=1, description="Debt to income ratio")
     employment_length: Optional[float] = Field(2, ge=0, description="Employment length in years")
@@ -59,6 +111,31 @@ class UserProfile(BaseModel):
     credit_utilization: Optional[float] = Field(0.3, ge=0, le=1, description="Credit utilization ratio")
     recent_inquiries: Optional[int] = Field(1, ge=0, description="Number of recent credit inquiries")
     region: Optional[str] = Field("urban", description="Geographic region")
+    
+    @field_validator('user_id')
+    @classmethod
+    def strip_user_id(cls, value: str) -> str:
+        value = value.strip()
+        if not value:
+            raise ValueError("User ID cannot be empty")
+        return value
+    
+    @field_validator(*OPTIONAL_FIELD_RANGES)
+    @classmethod
+    def default_out_of_range(cls, value, info: ValidationInfo):
+        min_val, max_val, default = OPTIONAL_FIELD_RANGES[info.field_name]
+        if value is None:
+            return default
+        if not (min_val <= value <= max_val):
+            logger.warning(f"{info.field_name} value {value} out of range [{min_val}, {max_val}], using default")
+            return default
+        return value
+    
+    @field_validator('region')
+    @classmethod
+    def normalize_region(cls, value: Optional[str]) -> str:
+        region = (value or 'urban').lower()
+        return region if region in VALID_REGIONS else 'urban'
 
 class ScoreResponse(BaseModel):
     user_id: str
@@ -88,16 +165,14 @@ class LogEntry(BaseModel):
 # Middleware for logging requests
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = datetime.utcnow()
-    
-    # Log request
-    logger.info(f"Request: {request.method} {request.url}")
+    start_time = time.perf_counter()
     
     response = await call_next(request)
     
-    # Log response
-    process_time = (datetime.utcnow() - start_time).total_seconds()
-    logger.info(f"Response: {response.status_code} - {process_time:.3f}s")
+    # Log request and response together once the response is ready
+    if logger.isEnabledFor(logging.INFO):
+        process_time = time.perf_counter() - start_time
+        logger.info(f"{request.method} {request.url} - {response.status_code} - {process_time:.3f}s")
     
     return response
 
@@ -107,7 +182,8 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        # ORJSONResponse serializes the datetime natively, no isoformat() call
+        "timestamp": datetime.utcnow(),
         "version": "1.0.0"
     }
 
@@ -126,8 +202,8 @@ async def score_user(
     Rate limited based on user tier.
     """
     try:
-        # Validate input data
-        user_data = validate_user_data(profile.dict())
+        # Pydantic has already validated and normalized the profile
+        user_data = profile.model_dump()
         
         # Get rate limit info for headers
         rate_info = rate_limiter.check_rate_limit(current_user, "score_user")
@@ -177,24 +253,14 @@ async def get_logs(
         if not os.path.exists(log_file):
             return {"logs": [], "total_lines": 0}
         
-        with open(log_file, 'r') as f:
-            all_lines = f.readlines()
-        
-        # Filter by level if specified
-        if level:
-            filtered_lines = [
-                line for line in all_lines 
-                if level.upper() in line
-            ]
-        else:
-            filtered_lines = all_lines
-        
-        # Get last N lines
-        recent_lines = filtered_lines[-lines:] if lines > 0 else filtered_lines
+        # Only the tail is read; the level filter runs on undecoded bytes
+        recent_lines, total_lines = _tail_log_lines(
+            log_file, lines, level.upper().encode() if level else None
+        )
         
         return {
-            "logs": [line.strip() for line in recent_lines],
-            "total_lines": len(filtered_lines),
+            "logs": [line.decode('utf-8', errors='replace').strip() for line in recent_lines],
+            "total_lines": total_lines,
             "requested_lines": lines,
             "level_filter": level
         }
@@ -352,7 +418,7 @@ async def get_stats(
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Custom HTTP exception handler"""
     logger.error(f"HTTP {exc.status_code}: {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail, "status_code": exc.status_code}
     )
@@ -361,7 +427,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 async def general_exception_handler(request: Request, exc: Exception):
     """General exception handler"""
     logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": "Internal server error", "status_code": 500}
     )
@@ -377,6 +443,9 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        loop="uvloop",
+        http="httptools",
+        log_level="info",
+        access_log=False
     )
 
@@ -7,21 +7,120 @@ It ensures retrains save models with proper versioning and maintains model metad
 """
 
 import os
-import json
+import orjson
+import mmap
 import pickle
 import shutil
+import zipfile
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
-import hashlib
 import sqlite3
+import threading
+import blake3
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
+from cachetools import LRUCache
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import skops.io as skops_io
+except ImportError:
+    skops_io = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds between background flushes of buffered performance metrics
+METRIC_FLUSH_INTERVAL = 1
+
+# Buffered metrics that trigger an early flush
+METRIC_FLUSH_SIZE = 1000
+
+# SQL used on hot paths, kept as constants so the connection's statement
+# cache always sees the identical string
+_SQL_INSERT_META = """
+    INSERT INTO model_metadata (
+        version, train_date, accuracy, precision_score, recall_score,
+        f1_score, auc_score, training_samples, feature_count, model_type,
+        hyperparameters, training_duration, data_hash, model_hash,
+        validation_score, cross_validation_scores, feature_importance,
+        created_by, notes, is_active, is_production, model_format
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_PERF = """
+    INSERT INTO model_performance 
+    (model_version, timestamp, metric_name, metric_value, sample_size, notes)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_DEPLOY = """
+    INSERT INTO deployment_history 
+    (model_version, deployment_type, environment, deployed_at, 
+     deployed_by, rollback_version, status, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_SELECT_BY_VERSION = "SELECT * FROM model_metadata WHERE version = ?"
+
+_SQL_INSERT_FEATURE = """
+    INSERT INTO feature_importance (model_version, feature_name, importance)
+    VALUES (?, ?, ?)
+"""
+
+_SQL_SELECT_FEATURES = """
+    SELECT feature_name, importance FROM feature_importance
+    WHERE model_version = ?
+    ORDER BY rowid
+"""
+
+# Metadata JSON columns accept numpy scalars and non-string keys like
+# json.dumps did
+_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _dumps_json(value: Any) -> str:
+    """Serialize a metadata field for a TEXT column"""
+    return orjson.dumps(value, option=_JSON_OPTIONS).decode()
+
+# Frame magic number that marks a zstd-compressed model file
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Local file header that starts a skops (zip) model file
+_ZIP_MAGIC = b'PK\x03\x04'
+
+MODEL_FORMATS = ("pickle", "skops")
+
+# Types a skops model file may contain beyond those skops trusts by default:
+# the estimators our training pipelines produce. Files declaring anything
+# else are refused on load
+SKOPS_TRUSTED_TYPES = [
+    "sklearn.pipeline.Pipeline",
+    "sklearn.preprocessing._data.StandardScaler",
+    "sklearn.ensemble._forest.RandomForestClassifier",
+    "sklearn.tree._classes.DecisionTreeClassifier",
+    "sklearn.tree._tree.Tree",
+]
+
+class _HashingWriter:
+    """File-like wrapper that hashes everything written through it"""
+    
+    def __init__(self, f):
+        self.f = f
+        self.hash = blake3.blake3(max_threads=blake3.blake3.AUTO)
+    
+    def write(self, data) -> int:
+        self.hash.update(data)
+        return self.f.write(data)
+
 @dataclass
 class ModelMetadata:
     """Model metadata structure"""
@@ -46,17 +145,20 @@ class ModelMetadata:
     notes: str
     is_active: bool = False
     is_production: bool = False
+    model_format: str = ""  # "pickle" or "skops"; empty picks one on save
 
 class ModelManager:
     """Comprehensive model management system"""
     
-    def __init__(self, models_dir: str = "models", metadata_db: str = "data/model_metadata.db"):
+    def __init__(self, models_dir: str = "models", metadata_db: str = "data/model_metadata.db",
+                 metric_flush_interval: float = METRIC_FLUSH_INTERVAL):
         """
         Initialize model manager
         
         Args:
             models_dir: Directory to store model files
             metadata_db: Path to SQLite database for metadata
+            metric_flush_interval: Seconds between background metric flushes
         """
         self.models_dir = Path(models_dir)
         self.metadata_db = metadata_db
@@ -65,16 +167,107 @@ class ModelManager:
         self.models_dir.mkdir(exist_ok=True)
         Path(metadata_db).parent.mkdir(exist_ok=True)
         
+        # Read cache for list/metadata/history queries, valid while the
+        # revision counter is unchanged; every write bumps it
+        self._rev = 0
+        self._read_cache = LRUCache(maxsize=256)
+        
+        # One long-lived connection in autocommit mode shared by all threads;
+        # the lock serializes access and writes that belong together are
+        # grouped explicitly with batch(). Re-entrant because batch() nests
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(metadata_db, isolation_level=None,
+                                     check_same_thread=False, cached_statements=256)
+        self._conn.row_factory = sqlite3.Row
+        # page_size only applies to a new database, so it precedes WAL
+        self._conn.execute("PRAGMA page_size=4096")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-20000")
+        # Read-mostly on the serving path: map the file instead of read()ing
+        # pages, and keep the WAL short so those reads stay in the main file
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        self._conn.execute("PRAGMA wal_autocheckpoint=1000")
+        
         # Initialize database
         self._init_metadata_db()
         
-        # Current model cache
+        # Current model cache, keyed by the (version, mtime_ns) of the file it
+        # came from and revalidated whenever the database revision moves
         self._current_model = None
         self._current_metadata = None
+        self._current_fingerprint = None
+        self._current_rev = -1
+        
+        # Model files are written off the caller's thread; versions handed
+        # out but not yet in the database are reserved here
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="model-io")
+        self._pending_versions = set()
+        
+        # Performance metrics are appended here and written in batches
+        self._metric_buffer = deque()
+        self._metric_flush_interval = metric_flush_interval
+        self._closed = threading.Event()
+        self._metric_thread = threading.Thread(
+            target=self._run_metric_flush, name="model-metric-flush", daemon=True
+        )
+        self._metric_thread.start()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Run the enclosed database writes in a single transaction
+        
+        Nested calls join the outer transaction, so helpers can use batch()
+        on their own and still be grouped by a caller. The connection lock is
+        held for the whole transaction.
+        """
+        with self._lock:
+            if self._conn.in_transaction:
+                yield self._conn
+                return
+            
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                self._invalidate()
+                raise
+            self._conn.execute("COMMIT")
+            self._invalidate()
+    
+    def _invalidate(self):
+        """Bump the revision so cached reads are refreshed"""
+        with self._lock:
+            self._rev += 1
+    
+    def _cached(self, key: Tuple, loader):
+        """Return a cached read for key, reloading it if anything was written since"""
+        # LRUCache reorders itself even on get, so it is only touched under the lock
+        with self._lock:
+            rev = self._rev
+            hit = self._read_cache.get(key)
+            if hit is not None and hit[0] == rev:
+                return hit[1]
+            
+            value = loader()
+            self._read_cache[key] = (rev, value)
+            return value
+    
+    def close(self):
+        """Wait for pending saves, flush metrics and close the metadata database connection"""
+        self._closed.set()
+        self._metric_thread.join()
+        self._io_pool.shutdown(wait=True)
+        self.flush_metrics()
+        with self._lock:
+            self._conn.close()
     
     def _init_metadata_db(self):
         """Initialize metadata database"""
-        with sqlite3.connect(self.metadata_db) as conn:
+        with self.batch() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -101,10 +294,16 @@ class ModelManager:
                     notes TEXT,
                     is_active BOOLEAN DEFAULT FALSE,
                     is_production BOOLEAN DEFAULT FALSE,
+                    model_format TEXT NOT NULL DEFAULT 'pickle',
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             """)
             
+            # Databases created before model_format existed hold pickles only
+            columns = {row['name'] for row in cursor.execute("PRAGMA table_info(model_metadata)")}
+            if "model_format" not in columns:
+                cursor.execute("ALTER TABLE model_metadata ADD COLUMN model_format TEXT NOT NULL DEFAULT 'pickle'")
+            
             # Create performance tracking table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS model_performance (
@@ -137,39 +336,47 @@ class ModelManager:
                 )
             """)
             
-            conn.commit()
+            # Create indexes for the hot lookups
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_meta_active ON model_metadata(is_active, created_at DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_meta_prod ON model_metadata(is_production)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_perf_version_ts ON model_performance(model_version, timestamp DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_deploy_version ON deployment_history(model_version, deployed_at DESC)")
+            
+            # Feature importance lives in its own table rather than as JSON in
+            # model_metadata, so wide models do not bloat every metadata row
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS feature_importance (
+                    model_version TEXT NOT NULL,
+                    feature_name TEXT NOT NULL,
+                    importance REAL NOT NULL,
+                    PRIMARY KEY (model_version, feature_name),
+                    FOREIGN KEY (model_version) REFERENCES model_metadata (version)
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_feature_rank ON feature_importance(model_version, importance DESC)")
     
     def generate_version(self) -> str:
         """Generate new model version"""
         # Get current date
         date_str = datetime.now().strftime("%Y%m%d")
         
-        # Find existing versions for today
-        with sqlite3.connect(self.metadata_db) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT version FROM model_metadata 
-                WHERE version LIKE ? 
-                ORDER BY version DESC
-            """, (f"v{date_str}%",))
-            
-            existing_versions = [row[0] for row in cursor.fetchall()]
-        
-        # Generate new version number
-        if not existing_versions:
-            return f"v{date_str}_001"
-        else:
-            # Extract the highest sequence number
-            sequences = []
-            for version in existing_versions:
-                try:
-                    seq = int(version.split('_')[-1])
-                    sequences.append(seq)
-                except (ValueError, IndexError):
-                    continue
+        # Take the highest sequence number for today in one aggregate
+        with self._lock:
+            cursor = self._conn.execute("""
+                SELECT COALESCE(MAX(CAST(substr(version, 11) AS INTEGER)), 0)
+                FROM model_metadata
+                WHERE version LIKE ?
+            """, (f"v{date_str}_%",))
+            next_seq = cursor.fetchone()[0] + 1
             
-            next_seq = max(sequences) + 1 if sequences else 1
-            return f"v{date_str}_{next_seq:03d}"
+            # Skip past versions reserved by saves still being written
+            prefix = f"v{date_str}_"
+            for version in self._pending_versions:
+                seq = version[len(prefix):]
+                if version.startswith(prefix) and seq.isdigit():
+                    next_seq = max(next_seq, int(seq) + 1)
+        
+        return f"v{date_str}_{next_seq:03d}"
     
     def save_model(self, model: Any, metadata: ModelMetadata, 
                    training_data_hash: str = None) -> str:
@@ -184,116 +391,281 @@ class ModelManager:
         Returns:
             Model version string
         """
-        # Generate version if not provided
-        if not metadata.version:
-            metadata.version = self.generate_version()
+        return self.save_model_async(model, metadata, training_data_hash).result()
+    
+    def save_model_async(self, model: Any, metadata: ModelMetadata,
+                         training_data_hash: str = None) -> Future:
+        """
+        Save model on the background I/O pool
         
-        # Calculate model hash
-        model_hash = self._calculate_model_hash(model)
-        metadata.model_hash = model_hash
+        The version is assigned before returning, so metadata.version is
+        usable immediately. The model must not be modified until the
+        returned future resolves.
+        
+        Returns:
+            Future resolving to the model version string
+        """
+        with self._lock:
+            # Generate version if not provided, reserving it until written
+            if not metadata.version:
+                metadata.version = self.generate_version()
+            self._pending_versions.add(metadata.version)
         
         if training_data_hash:
             metadata.data_hash = training_data_hash
         
-        # Save model file
+        format_requested = bool(metadata.model_format)
+        if not format_requested:
+            metadata.model_format = self._default_format(model)
+        elif metadata.model_format not in MODEL_FORMATS:
+            raise ValueError(f"Unknown model format {metadata.model_format!r}")
+        elif metadata.model_format == "skops" and skops_io is None:
+            raise RuntimeError("model_format 'skops' requires skops to be installed")
+        
+        return self._io_pool.submit(self._write_model, model, metadata, format_requested)
+    
+    def _write_model(self, model: Any, metadata: ModelMetadata, format_requested: bool = True) -> str:
+        """Write the model file durably, then record its metadata"""
         model_path = self.models_dir / f"model_{metadata.version}.pkl"
+        tmp_path = self.models_dir / f".model_{metadata.version}.pkl.tmp"
         
         try:
-            with open(model_path, 'wb') as f:
-                pickle.dump(model, f)
+            # A model skops could not load back is saved as a pickle instead,
+            # unless skops was asked for explicitly
+            skops_data = None
+            if metadata.model_format == "skops":
+                skops_data = self._dump_skops(model, required=format_requested)
+                if skops_data is None:
+                    metadata.model_format = "pickle"
+            
+            # The model hash is computed from the stream as it is written
+            with open(tmp_path, 'wb') as f:
+                metadata.model_hash = self._dump_model(model, f, skops_data)
+                f.flush()
+                os.fsync(f.fileno())
+            
+            # Only a complete file ever appears under the model name
+            os.replace(tmp_path, model_path)
+            self._fsync_models_dir()
             
             logger.info(f"Model saved to {model_path}")
             
-            # Save metadata to database
-            self._save_metadata(metadata)
+            # Save metadata and log deployment in one transaction
+            with self.batch() as conn:
+                cursor = conn.cursor()
+                self._save_metadata(cursor, metadata)
+                self._log_deployment(cursor, metadata.version, "save", "development", 
+                                   metadata.created_by, "Model saved successfully")
             
             # Update latest model symlink
             self._update_latest_model(metadata.version)
             
-            # Log deployment
-            self._log_deployment(metadata.version, "save", "development", 
-                               metadata.created_by, "Model saved successfully")
-            
             return metadata.version
             
         except Exception as e:
             logger.error(f"Error saving model: {e}")
             # Clean up partial save
-            if model_path.exists():
-                model_path.unlink()
+            for path in (tmp_path, model_path):
+                if path.exists():
+                    path.unlink()
             raise
+        
+        finally:
+            with self._lock:
+                self._pending_versions.discard(metadata.version)
     
-    def _calculate_model_hash(self, model: Any) -> str:
-        """Calculate hash of model for integrity checking"""
+    def _fsync_models_dir(self):
+        """Flush the models directory so a rename survives a crash"""
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        
+        fd = os.open(self.models_dir, os.O_RDONLY | os.O_DIRECTORY)
         try:
-            model_bytes = pickle.dumps(model)
-            return hashlib.sha256(model_bytes).hexdigest()
-        except Exception as e:
-            logger.warning(f"Could not calculate model hash: {e}")
-            return "unknown"
+            os.fsync(fd)
+        finally:
+            os.close(fd)
     
-    def _save_metadata(self, metadata: ModelMetadata):
-        """Save metadata to database"""
-        with sqlite3.connect(self.metadata_db) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO model_metadata (
-                    version, train_date, accuracy, precision_score, recall_score,
-                    f1_score, auc_score, training_samples, feature_count, model_type,
-                    hyperparameters, training_duration, data_hash, model_hash,
-                    validation_score, cross_validation_scores, feature_importance,
-                    created_by, notes, is_active, is_production
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                metadata.version,
-                metadata.train_date,
-                metadata.accuracy,
-                metadata.precision,
-                metadata.recall,
-                metadata.f1_score,
-                metadata.auc_score,
-                metadata.training_samples,
-                metadata.feature_count,
-                metadata.model_type,
-                json.dumps(metadata.hyperparameters),
-                metadata.training_duration,
-                metadata.data_hash,
-                metadata.model_hash,
-                metadata.validation_score,
-                json.dumps(metadata.cross_validation_scores),
-                json.dumps(metadata.feature_importance),
-                metadata.created_by,
-                metadata.notes,
-                metadata.is_active,
-                metadata.is_production
-            ))
-            
-            conn.commit()
+    def _default_format(self, model: Any) -> str:
+        """Pick skops for scikit-learn models when it is installed, else pickle"""
+        if skops_io is not None and type(model).__module__.startswith("sklearn."):
+            return "skops"
+        return "pickle"
+    
+    def _dump_skops(self, model: Any, required: bool) -> Optional[bytes]:
+        """
+        Serialize a model with skops if it only uses SKOPS_TRUSTED_TYPES
+        
+        Returns None for a model that would be refused on load, or raises
+        ValueError when skops is required.
+        """
+        data = skops_io.dumps(model, compression=zipfile.ZIP_DEFLATED)
+        untrusted = sorted(set(skops_io.get_untrusted_types(data=data)) - set(SKOPS_TRUSTED_TYPES))
+        if not untrusted:
+            return data
+        
+        if required:
+            raise ValueError(f"skops cannot load types outside SKOPS_TRUSTED_TYPES: {untrusted}")
+        logger.info(f"Saving model as pickle; skops cannot load types {untrusted}")
+        return None
+    
+    def _dump_model(self, model: Any, f, skops_data: Optional[bytes] = None) -> str:
+        """
+        Serialize a model into an open file
+        
+        Pickles are zstd-compressed when available. A skops archive from
+        _dump_skops is written as is, already being deflate-compressed.
+        
+        Returns:
+            Hash for integrity checking: of the uncompressed pickle stream,
+            or of the skops archive as written
+        """
+        if skops_data is not None:
+            writer = _HashingWriter(f)
+            writer.write(skops_data)
+            return writer.hash.hexdigest()
+        
+        if zstandard is None:
+            writer = _HashingWriter(f)
+            pickle.dump(model, writer, protocol=pickle.HIGHEST_PROTOCOL)
+            return writer.hash.hexdigest()
+        
+        compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+        with compressor.stream_writer(f, closefd=False) as compressed:
+            writer = _HashingWriter(compressed)
+            pickle.dump(model, writer, protocol=pickle.HIGHEST_PROTOCOL)
+        return writer.hash.hexdigest()
+    
+    def _load_model_file(self, model_path: Path) -> Any:
+        """Load a model file written by _dump_model or a plain pickle.dump"""
+        with open(model_path, 'rb') as f:
+            # Map the file instead of reading it through a buffered copy
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic = mm[:4]
+                
+                if magic == _ZIP_MAGIC:
+                    if skops_io is None:
+                        raise RuntimeError(f"{model_path} is a skops file but skops is not installed")
+                    # Only the expected estimator types are trusted; skops
+                    # refuses files that declare any other type
+                    return skops_io.loads(mm[:], trusted=SKOPS_TRUSTED_TYPES)
+                
+                if magic != _ZSTD_MAGIC:
+                    return pickle.load(mm)
+                
+                if zstandard is None:
+                    raise RuntimeError(f"{model_path} is zstd-compressed but zstandard is not installed")
+                
+                with zstandard.ZstdDecompressor().stream_reader(mm) as reader:
+                    return pickle.load(reader)
+    
+    def _save_metadata(self, cursor: sqlite3.Cursor, metadata: ModelMetadata):
+        """Save metadata using a cursor inside the caller's batch()"""
+        cursor.execute(_SQL_INSERT_META, (
+            metadata.version,
+            metadata.train_date,
+            metadata.accuracy,
+            metadata.precision,
+            metadata.recall,
+            metadata.f1_score,
+            metadata.auc_score,
+            metadata.training_samples,
+            metadata.feature_count,
+            metadata.model_type,
+            _dumps_json(metadata.hyperparameters),
+            metadata.training_duration,
+            metadata.data_hash,
+            metadata.model_hash,
+            metadata.validation_score,
+            _dumps_json(metadata.cross_validation_scores),
+            "{}",  # rows are in feature_importance
+            metadata.created_by,
+            metadata.notes,
+            metadata.is_active,
+            metadata.is_production,
+            metadata.model_format
+        ))
+        cursor.executemany(_SQL_INSERT_FEATURE, [
+            (metadata.version, str(name), float(importance))
+            for name, importance in metadata.feature_importance.items()
+        ])
     
     def _update_latest_model(self, version: str):
         """Update latest_model.pkl symlink"""
         latest_path = self.models_dir / "latest_model.pkl"
         model_path = self.models_dir / f"model_{version}.pkl"
+        tmp_path = self.models_dir / f".latest_model.pkl.{os.getpid()}.{threading.get_ident()}.tmp"
         
         try:
-            # Remove existing symlink
-            if latest_path.exists() or latest_path.is_symlink():
-                latest_path.unlink()
+            # A crashed earlier swap may have left the temp link behind
+            tmp_path.unlink(missing_ok=True)
             
-            # Create new symlink
-            latest_path.symlink_to(model_path.name)
+            # Build the new symlink aside and rename it over the old one, so
+            # readers always find either the old or the new target
+            tmp_path.symlink_to(model_path.name)
+            os.replace(tmp_path, latest_path)
             logger.info(f"Updated latest_model.pkl to point to {version}")
             
         except Exception as e:
             logger.error(f"Error updating latest model symlink: {e}")
             # Fallback: copy file
             try:
-                shutil.copy2(model_path, latest_path)
+                tmp_path.unlink(missing_ok=True)
+                shutil.copy2(model_path, tmp_path)
+                os.replace(tmp_path, latest_path)
                 logger.info(f"Copied {version} to latest_model.pkl as fallback")
             except Exception as e2:
                 logger.error(f"Fallback copy also failed: {e2}")
     
+    def _row_to_metadata(self, row: sqlite3.Row) -> ModelMetadata:
+        """Build ModelMetadata from a model_metadata row"""
+        return ModelMetadata(
+            version=row['version'],
+            train_date=row['train_date'],
+            accuracy=row['accuracy'],
+            precision=row['precision_score'],
+            recall=row['recall_score'],
+            f1_score=row['f1_score'],
+            auc_score=row['auc_score'],
+            training_samples=row['training_samples'],
+            feature_count=row['feature_count'],
+            model_type=row['model_type'],
+            hyperparameters=orjson.loads(row['hyperparameters']),
+            training_duration=row['training_duration'],
+            data_hash=row['data_hash'],
+            model_hash=row['model_hash'],
+            validation_score=row['validation_score'],
+            cross_validation_scores=orjson.loads(row['cross_validation_scores']),
+            feature_importance=self._load_feature_importance(row),
+            created_by=row['created_by'],
+            notes=row['notes'],
+            is_active=bool(row['is_active']),
+            is_production=bool(row['is_production']),
+            model_format=row['model_format']
+        )
+    
+    def _load_feature_importance(self, row: sqlite3.Row) -> Dict[str, float]:
+        """Read feature importance for a metadata row"""
+        with self._lock:
+            features = self._conn.execute(_SQL_SELECT_FEATURES, (row['version'],)).fetchall()
+        
+        if features:
+            return {name: importance for name, importance in features}
+        
+        # Rows saved before the feature_importance table kept it as JSON
+        return orjson.loads(row['feature_importance'])
+    
+    def get_top_features(self, version: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Get the most important features of a model version, highest first"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT feature_name, importance FROM feature_importance
+                WHERE model_version = ?
+                ORDER BY importance DESC
+                LIMIT ?
+            """, (version, limit)).fetchall()
+        
+        return [(name, importance) for name, importance in rows]
+    
     def load_latest_model(self) -> Tuple[Any, ModelMetadata]:
         """
         Load the latest active model
@@ -301,17 +673,19 @@ class ModelManager:
         Returns:
             Tuple of (model, metadata)
         """
-        # Check cache first
-        if self._current_model is not None and self._current_metadata is not None:
-            return self._current_model, self._current_metadata
+        # Nothing was written since the cached model was resolved
+        cached = self._current_model
+        if cached is not None and self._current_rev == self._rev:
+            return cached, self._current_metadata
         
+        rev = self._rev
         # Get latest active model from database
-        with sqlite3.connect(self.metadata_db) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
             cursor.execute("""
-                SELECT * FROM model_metadata 
-                WHERE is_active = TRUE 
-                ORDER BY created_at DESC 
+                SELECT * FROM model_metadata
+                WHERE is_active = TRUE
+                ORDER BY created_at DESC
                 LIMIT 1
             """)
             
@@ -320,8 +694,8 @@ class ModelManager:
             if not row:
                 # No active model, get the latest model
                 cursor.execute("""
-                    SELECT * FROM model_metadata 
-                    ORDER BY created_at DESC 
+                    SELECT * FROM model_metadata
+                    ORDER BY created_at DESC
                     LIMIT 1
                 """)
                 row = cursor.fetchone()
@@ -329,21 +703,7 @@ class ModelManager:
         if not row:
             raise FileNotFoundError("No models found in database")
         
-        # Convert row to metadata
-        columns = [description[0] for description in cursor.description]
-        metadata_dict = dict(zip(columns, row))
-        
-        # Parse JSON fields
-        metadata_dict['hyperparameters'] = json.loads(metadata_dict['hyperparameters'])
-        metadata_dict['cross_validation_scores'] = json.loads(metadata_dict['cross_validation_scores'])
-        metadata_dict['feature_importance'] = json.loads(metadata_dict['feature_importance'])
-        
-        # Map database fields to dataclass fields
-        metadata_dict['precision'] = metadata_dict.pop('precision_score')
-        metadata_dict['recall'] = metadata_dict.pop('recall_score')
-        
-        metadata = ModelMetadata(**{k: v for k, v in metadata_dict.items() 
-                                  if k in ModelMetadata.__dataclass_fields__})
+        metadata = self._row_to_metadata(row)
         
         # Load model file
         model_path = self.models_dir / f"model_{metadata.version}.pkl"
@@ -356,13 +716,18 @@ class ModelManager:
             else:
                 raise FileNotFoundError(f"Model file not found: {model_path}")
         
+        # Deployment bookkeeping bumps the revision without changing the
+        # model; reuse it while the same file is still in place
+        fingerprint = (metadata.version, model_path.stat().st_mtime_ns)
+        if cached is not None and fingerprint == self._current_fingerprint:
+            self._remember_current(cached, metadata, fingerprint, rev)
+            return cached, metadata
+        
         try:
-            with open(model_path, 'rb') as f:
-                model = pickle.load(f)
+            model = self._load_model_file(model_path)
             
             # Cache the loaded model
-            self._current_model = model
-            self._current_metadata = metadata
+            self._remember_current(model, metadata, fingerprint, rev)
             
             logger.info(f"Loaded model {metadata.version} from {model_path}")
             return model, metadata
@@ -371,6 +736,14 @@ class ModelManager:
             logger.error(f"Error loading model from {model_path}: {e}")
             raise
     
+    def _remember_current(self, model: Any, metadata: ModelMetadata,
+                          fingerprint: Tuple[str, int], rev: int):
+        """Cache the current model along with the fingerprint that revalidates it"""
+        self._current_model = model
+        self._current_metadata = metadata
+        self._current_fingerprint = fingerprint
+        self._current_rev = rev
+    
     def load_model_by_version(self, version: str) -> Tuple[Any, ModelMetadata]:
         """
         Load a specific model version
@@ -382,32 +755,14 @@ class ModelManager:
             Tuple of (model, metadata)
         """
         # Get metadata from database
-        with sqlite3.connect(self.metadata_db) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM model_metadata WHERE version = ?
-            """, (version,))
-            
+        with self._lock:
+            cursor = self._conn.execute(_SQL_SELECT_BY_VERSION, (version,))
             row = cursor.fetchone()
-            
-            if not row:
-                raise ValueError(f"Model version {version} not found")
-            
-            # Convert to metadata object
-            columns = [description[0] for description in cursor.description]
-            metadata_dict = dict(zip(columns, row))
-            
-            # Parse JSON fields
-            metadata_dict['hyperparameters'] = json.loads(metadata_dict['hyperparameters'])
-            metadata_dict['cross_validation_scores'] = json.loads(metadata_dict['cross_validation_scores'])
-            metadata_dict['feature_importance'] = json.loads(metadata_dict['feature_importance'])
-            
-            # Map database fields
-            metadata_dict['precision'] = metadata_dict.pop('precision_score')
-            metadata_dict['recall'] = metadata_dict.pop('recall_score')
-            
-            metadata = ModelMetadata(**{k: v for k, v in metadata_dict.items() 
-                                      if k in ModelMetadata.__dataclass_fields__})
+        
+        if not row:
+            raise ValueError(f"Model version {version} not found")
+        
+        metadata = self._row_to_metadata(row)
         
         # Load model file
         model_path = self.models_dir / f"model_{version}.pkl"
@@ -415,8 +770,7 @@ class ModelManager:
         if not model_path.exists():
             raise FileNotFoundError(f"Model file not found: {model_path}")
         
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
+        model = self._load_model_file(model_path)
         
         logger.info(f"Loaded model {version}")
         return model, metadata
@@ -429,35 +783,29 @@ class ModelManager:
             version: Model version to activate
             deployed_by: Who is deploying this model
         """
-        with sqlite3.connect(self.metadata_db) as conn:
+        with self.batch() as conn:
             cursor = conn.cursor()
             
-            # Deactivate all models
-            cursor.execute("UPDATE model_metadata SET is_active = FALSE")
+            cursor.execute("SELECT 1 FROM model_metadata WHERE version = ?", (version,))
+            if cursor.fetchone() is None:
+                raise ValueError(f"Model version {version} not found")
             
-            # Activate specified model
+            # Activate the specified model and deactivate the rest in one
+            # pass, only touching rows whose flag changes
             cursor.execute("""
                 UPDATE model_metadata 
-                SET is_active = TRUE 
-                WHERE version = ?
-            """, (version,))
+                SET is_active = (version = ?) 
+                WHERE is_active = TRUE OR version = ?
+            """, (version, version))
             
-            if cursor.rowcount == 0:
-                raise ValueError(f"Model version {version} not found")
-            
-            conn.commit()
+            # Log deployment
+            self._log_deployment(cursor, version, "activate", "production", 
+                               deployed_by, f"Model {version} set as active")
         
-        # Update latest model symlink
+        # Update latest model symlink; the cached model is revalidated on
+        # the next load_latest_model
         self._update_latest_model(version)
         
-        # Clear cache to force reload
-        self._current_model = None
-        self._current_metadata = None
-        
-        # Log deployment
-        self._log_deployment(version, "activate", "production", 
-                           deployed_by, f"Model {version} set as active")
-        
         logger.info(f"Model {version} set as active")
     
     def set_production_model(self, version: str, deployed_by: str = "system"):
@@ -468,155 +816,174 @@ class ModelManager:
             version: Model version to set as production
             deployed_by: Who is deploying this model
         """
-        with sqlite3.connect(self.metadata_db) as conn:
-            cursor = conn.cursor()
-            
-            # Get current production model for rollback reference
-            cursor.execute("""
-                SELECT version FROM model_metadata 
-                WHERE is_production = TRUE
-            """)
-            current_prod = cursor.fetchone()
-            rollback_version = current_prod[0] if current_prod else None
-            
-            # Deactivate all production models
-            cursor.execute("UPDATE model_metadata SET is_production = FALSE")
-            
-            # Set new production model
-            cursor.execute("""
-                UPDATE model_metadata 
-                SET is_production = TRUE, is_active = TRUE 
-                WHERE version = ?
-            """, (version,))
-            
-            if cursor.rowcount == 0:
-                raise ValueError(f"Model version {version} not found")
-            
-            conn.commit()
+        with self.batch() as conn:
+            self._promote_to_production(conn.cursor(), version, deployed_by)
         
-        # Update latest model symlink
+        # Update latest model symlink once the flags are committed; the
+        # cached model is revalidated on the next load_latest_model
         self._update_latest_model(version)
         
-        # Clear cache
-        self._current_model = None
-        self._current_metadata = None
+        logger.info(f"Model {version} deployed to production")
+    
+    def _promote_to_production(self, cursor: sqlite3.Cursor, version: str, deployed_by: str):
+        """Flag a version as production and active inside the caller's batch()"""
+        # Get current production model for rollback reference, and
+        # check the target exists, in one lookup
+        cursor.execute("""
+            SELECT version, is_production FROM model_metadata 
+            WHERE is_production = TRUE OR version = ?
+        """, (version,))
+        rows = cursor.fetchall()
+        
+        if not any(row['version'] == version for row in rows):
+            raise ValueError(f"Model version {version} not found")
+        
+        rollback_version = next((row['version'] for row in rows if row['is_production']), None)
+        
+        # Move the production flag and activate the new model in one pass
+        cursor.execute("""
+            UPDATE model_metadata 
+            SET is_production = (version = ?), 
+                is_active = CASE WHEN version = ? THEN TRUE ELSE is_active END 
+            WHERE is_production = TRUE OR version = ?
+        """, (version, version, version))
         
         # Log deployment
-        self._log_deployment(version, "production_deploy", "production", 
+        self._log_deployment(cursor, version, "production_deploy", "production", 
                            deployed_by, f"Model {version} deployed to production",
                            rollback_version)
-        
-        logger.info(f"Model {version} deployed to production")
     
-    def _log_deployment(self, version: str, deployment_type: str, environment: str,
-                       deployed_by: str, notes: str, rollback_version: str = None):
-        """Log deployment to history"""
-        with sqlite3.connect(self.metadata_db) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO deployment_history 
-                (model_version, deployment_type, environment, deployed_at, 
-                 deployed_by, rollback_version, status, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                version, deployment_type, environment, 
-                datetime.now().timestamp(), deployed_by, 
-                rollback_version, "success", notes
-            ))
-            conn.commit()
+    def _log_deployment(self, cursor: sqlite3.Cursor, version: str, deployment_type: str,
+                       environment: str, deployed_by: str, notes: str,
+                       rollback_version: str = None):
+        """Log deployment to history using a cursor inside the caller's batch()"""
+        cursor.execute(_SQL_INSERT_DEPLOY, (
+            version, deployment_type, environment, 
+            datetime.now().timestamp(), deployed_by, 
+            rollback_version, "success", notes
+        ))
     
     def get_model_list(self) -> List[Dict[str, Any]]:
-        """Get list of all models with metadata"""
-        with sqlite3.connect(self.metadata_db) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT version, train_date, accuracy, model_type, 
+        """
+        Get list of all models with metadata
+        
+        The result is cached until the next write and must not be mutated.
+        """
+        return self._cached(("model_list",), self._query_model_list)
+    
+    def _query_model_list(self) -> List[Dict[str, Any]]:
+        """Query the model list from the database"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT version, train_date, accuracy, model_type,
                        is_active, is_production, created_at
-                FROM model_metadata 
+                FROM model_metadata
                 ORDER BY created_at DESC
-            """)
-            
-            models = []
-            for row in cursor.fetchall():
-                models.append({
-                    "version": row[0],
-                    "train_date": row[1],
-                    "accuracy": row[2],
-                    "model_type": row[3],
-                    "is_active": bool(row[4]),
-                    "is_production": bool(row[5]),
-                    "created_at": row[6]
-                })
-            
-            return models
+            """).fetchall()
+        
+        models = []
+        for row in rows:
+            models.append({
+                "version": row[0],
+                "train_date": row[1],
+                "accuracy": row[2],
+                "model_type": row[3],
+                "is_active": bool(row[4]),
+                "is_production": bool(row[5]),
+                "created_at": row[6]
+            })
+        
+        return models
     
     def get_model_metadata(self, version: str) -> ModelMetadata:
-        """Get metadata for a specific model version"""
-        with sqlite3.connect(self.metadata_db) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM model_metadata WHERE version = ?
-            """, (version,))
-            
+        """
+        Get metadata for a specific model version
+        
+        The result is cached until the next write and must not be mutated.
+        """
+        return self._cached(("metadata", version), lambda: self._query_model_metadata(version))
+    
+    def _query_model_metadata(self, version: str) -> ModelMetadata:
+        """Query metadata for a model version from the database"""
+        with self._lock:
+            cursor = self._conn.execute(_SQL_SELECT_BY_VERSION, (version,))
             row = cursor.fetchone()
-            
-            if not row:
-                raise ValueError(f"Model version {version} not found")
-            
-            columns = [description[0] for description in cursor.description]
-            metadata_dict = dict(zip(columns, row))
-            
-            # Parse JSON fields
-            metadata_dict['hyperparameters'] = json.loads(metadata_dict['hyperparameters'])
-            metadata_dict['cross_validation_scores'] = json.loads(metadata_dict['cross_validation_scores'])
-            metadata_dict['feature_importance'] = json.loads(metadata_dict['feature_importance'])
-            
-            # Map database fields
-            metadata_dict['precision'] = metadata_dict.pop('precision_score')
-            metadata_dict['recall'] = metadata_dict.pop('recall_score')
-            
-            return ModelMetadata(**{k: v for k, v in metadata_dict.items() 
-                                  if k in ModelMetadata.__dataclass_fields__})
+        
+        if not row:
+            raise ValueError(f"Model version {version} not found")
+        
+        return self._row_to_metadata(row)
     
     def record_performance_metric(self, version: str, metric_name: str, 
                                 metric_value: float, sample_size: int = None,
                                 notes: str = None):
-        """Record a performance metric for a model"""
-        with sqlite3.connect(self.metadata_db) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO model_performance 
-                (model_version, timestamp, metric_name, metric_value, sample_size, notes)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                version, datetime.now().timestamp(), 
-                metric_name, metric_value, sample_size, notes
-            ))
-            conn.commit()
+        """
+        Record a performance metric for a model
+        
+        The metric is buffered and written with others by flush_metrics(),
+        at least every metric_flush_interval seconds.
+        """
+        self._metric_buffer.append((
+            version, datetime.now().timestamp(),
+            metric_name, metric_value, sample_size, notes
+        ))
+        
+        if len(self._metric_buffer) == METRIC_FLUSH_SIZE and not self._closed.is_set():
+            self._io_pool.submit(self.flush_metrics)
+    
+    def flush_metrics(self):
+        """Write buffered performance metrics in one transaction"""
+        batch = []
+        try:
+            while True:
+                batch.append(self._metric_buffer.popleft())
+        except IndexError:
+            pass
+        
+        if batch:
+            with self.batch() as conn:
+                conn.executemany(_SQL_INSERT_PERF, batch)
+    
+    def _run_metric_flush(self):
+        """Flush metrics every metric_flush_interval seconds until close()"""
+        while not self._closed.wait(self._metric_flush_interval):
+            try:
+                self.flush_metrics()
+            except Exception as e:
+                logger.error(f"Failed to flush performance metrics: {str(e)}")
     
     def get_performance_history(self, version: str) -> List[Dict[str, Any]]:
-        """Get performance history for a model"""
-        with sqlite3.connect(self.metadata_db) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+        """
+        Get performance history for a model
+        
+        Buffered metrics are flushed first. The result is cached until the
+        next write and must not be mutated.
+        """
+        self.flush_metrics()
+        return self._cached(("performance", version), lambda: self._query_performance_history(version))
+    
+    def _query_performance_history(self, version: str) -> List[Dict[str, Any]]:
+        """Query performance history for a model from the database"""
+        with self._lock:
+            rows = self._conn.execute("""
                 SELECT timestamp, metric_name, metric_value, sample_size, notes
-                FROM model_performance 
+                FROM model_performance
                 WHERE model_version = ?
                 ORDER BY timestamp DESC
-            """, (version,))
-            
-            history = []
-            for row in cursor.fetchall():
-                history.append({
-                    "timestamp": row[0],
-                    "metric_name": row[1],
-                    "metric_value": row[2],
-                    "sample_size": row[3],
-                    "notes": row[4],
-                    "date": datetime.fromtimestamp(row[0]).isoformat()
-                })
-            
-            return history
+            """, (version,)).fetchall()
+        
+        history = []
+        for row in rows:
+            history.append({
+                "timestamp": row[0],
+                "metric_name": row[1],
+                "metric_value": row[2],
+                "sample_size": row[3],
+                "notes": row[4],
+                "date": datetime.fromtimestamp(row[0]).isoformat()
+            })
+        
+        return history
     
     def rollback_to_version(self, version: str, deployed_by: str = "system"):
         """Rollback to a previous model version"""
@@ -633,21 +1000,26 @@ class ModelManager:
         except:
             pass
         
-        # Set as active and production
-        self.set_production_model(version, deployed_by)
-        
         # Log rollback
         rollback_notes = f"Rolled back to {version}"
         if current_metadata:
             rollback_notes += f" from {current_metadata.version}"
         
-        self._log_deployment(version, "rollback", "production", 
-                           deployed_by, rollback_notes)
+        # Set as active and production, logging both in one transaction
+        with self.batch() as conn:
+            cursor = conn.cursor()
+            self._promote_to_production(cursor, version, deployed_by)
+            self._log_deployment(cursor, version, "rollback", "production", 
+                               deployed_by, rollback_notes)
+        
+        # Only move the symlink once the transaction has committed
+        self._update_latest_model(version)
         
         logger.info(f"Rolled back to model {version}")
     
     def cleanup_old_models(self, keep_count: int = 10):
         """Clean up old model files, keeping the most recent ones"""
+        self.flush_metrics()
         models = self.get_model_list()
         
         if len(models) <= keep_count:
@@ -667,20 +1039,38 @@ class ModelManager:
         for model in recent_models[:keep_count]:
             models_to_keep.add(model['version'])
         
-        # Delete old model files
-        deleted_count = 0
-        for model in models:
-            if model['version'] not in models_to_keep:
-                model_path = self.models_dir / f"model_{model['version']}.pkl"
-                if model_path.exists():
-                    try:
-                        model_path.unlink()
-                        deleted_count += 1
-                        logger.info(f"Deleted old model file: {model_path}")
-                    except Exception as e:
-                        logger.error(f"Error deleting {model_path}: {e}")
-        
-        logger.info(f"Cleanup completed: {deleted_count} old model files deleted")
+        victims = [model['version'] for model in models 
+                   if model['version'] not in models_to_keep]
+        
+        # Prune metadata and performance rows in one transaction
+        with self.batch() as conn:
+            conn.executemany("DELETE FROM feature_importance WHERE model_version = ?",
+                             [(version,) for version in victims])
+            conn.executemany("DELETE FROM model_performance WHERE model_version = ?",
+                             [(version,) for version in victims])
+            conn.executemany("DELETE FROM model_metadata WHERE version = ?",
+                             [(version,) for version in victims])
+        
+        # Delete old model files; unlinks are independent syscalls
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            deleted_count = sum(executor.map(self._delete_model_file, victims))
+        
+        logger.info(f"Cleanup completed: {len(victims)} old models pruned, "
+                    f"{deleted_count} model files deleted")
+    
+    def _delete_model_file(self, version: str) -> bool:
+        """Delete a model file, returning whether a file was removed"""
+        model_path = self.models_dir / f"model_{version}.pkl"
+        try:
+            model_path.unlink()
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.error(f"Error deleting {model_path}: {e}")
+            return False
+        
+        logger.info(f"Deleted old model file: {model_path}")
+        return True
 
 # Global model manager instance
 _model_manager = None
@@ -6,38 +6,187 @@ This module provides API endpoints for accessing monitoring data and alerts.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Dict, List, Any, Optional
-import json
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from typing import Dict, List, Any, Optional, Tuple
+import orjson
+import asyncio
+import aiosqlite
+import logging
+from collections import Counter
+from contextlib import asynccontextmanager, AsyncExitStack
 from datetime import datetime, timedelta
 import time
 
-from .scoring_monitor import get_monitor, ScoringMonitor
-from .auth import verify_api_key, get_current_user
+from .scoring_monitor import get_monitor, ScoringMonitor, ScoringEvent
+from .auth import verify_api_key, get_current_user, require_permission
+from starlette.concurrency import run_in_threadpool
 
-# Create router for monitoring endpoints
-monitor_router = APIRouter(prefix="/monitor", tags=["monitoring"])
+# Create router for monitoring endpoints; responses are encoded with orjson,
+# which also serializes datetimes and dataclasses natively
+monitor_router = APIRouter(prefix="/monitor", tags=["monitoring"],
+                           default_response_class=ORJSONResponse)
+
+class MonitorDBPool:
+    """
+    Pool of long-lived aiosqlite connections to the monitor database
+    
+    Queries run on aiosqlite's worker threads instead of blocking the event
+    loop, and reusing connections keeps their page cache warm.
+    """
+    
+    def __init__(self, db_path: str, size: int = 4):
+        self.db_path = db_path
+        self.size = size
+        self._idle = None
+        self._created = 0
+    
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a connection tuned for read-heavy queries"""
+        conn = await aiosqlite.connect(self.db_path)
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute("PRAGMA mmap_size=268435456")
+        await conn.execute("PRAGMA cache_size=-8192")
+        return conn
+    
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a connection, opening one if the pool is not full yet"""
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        
+        if self._idle.empty() and self._created < self.size:
+            self._created += 1
+            try:
+                conn = await self._connect()
+            except Exception:
+                self._created -= 1
+                raise
+        else:
+            conn = await self._idle.get()
+        
+        try:
+            yield conn
+        finally:
+            self._idle.put_nowait(conn)
+    
+    async def close(self):
+        """Close all idle connections"""
+        while self._idle is not None and not self._idle.empty():
+            await self._idle.get_nowait().close()
+            self._created -= 1
+
+_pool: Optional[MonitorDBPool] = None
+
+def get_monitor_pool() -> MonitorDBPool:
+    """Get the connection pool for the global monitor's database"""
+    global _pool
+    db_path = get_monitor().db_path
+    if _pool is None or _pool.db_path != db_path:
+        _pool = MonitorDBPool(db_path)
+    return _pool
+
+async def close_monitor_pool():
+    """Close pooled monitor connections; call on application shutdown"""
+    if _pool is not None:
+        await _pool.close()
+
+# Path of the scoring endpoint whose requests the middleware logs
+_SCORE_PATH = "/score-user"
+
+# Scoring events logged by the middleware are queued and written in batches
+# of up to LOG_BATCH_SIZE, waiting at most LOG_BATCH_WAIT seconds to fill one
+LOG_QUEUE_SIZE = 10_000
+LOG_BATCH_SIZE = 100
+LOG_BATCH_WAIT = 0.2
+
+_log_queue: Optional[asyncio.Queue] = None
+_log_task: Optional[asyncio.Task] = None
+dropped_log_events = 0
+
+# Rows fetched from the database per round trip when streaming events
+EVENTS_FETCH_SIZE = 200
+
+# Seconds a cached /stats or /dashboard-data body is served for; polling
+# dashboards within the same bucket share one computation
+RESPONSE_CACHE_TTL = 3
+
+# Encoded response bodies keyed by endpoint, tagged with their time bucket
+_response_cache: Dict[str, Tuple[int, bytes]] = {}
+
+def _cached_body(endpoint: str) -> Optional[bytes]:
+    """Return the cached body for endpoint if it is from the current bucket"""
+    hit = _response_cache.get(endpoint)
+    if hit is not None and hit[0] == int(time.time() // RESPONSE_CACHE_TTL):
+        return hit[1]
+    return None
+
+def _cache_body(endpoint: str, data: Any) -> bytes:
+    """Encode data once and cache the bytes for the current bucket"""
+    body = orjson.dumps(data)
+    _response_cache[endpoint] = (int(time.time() // RESPONSE_CACHE_TTL), body)
+    return body
+
+def invalidate_response_cache():
+    """Drop cached monitor responses, e.g. after deleting data"""
+    _response_cache.clear()
+
+# Requests and errors per hour and API key over the dashboard window: rolled
+# up hours from hourly_stats, plus raw events newer than the last rollup
+_SQL_DASHBOARD_WINDOW = """
+    WITH live_from AS (
+        SELECT MAX(:start_time, (COALESCE(MAX(hour_bucket), -1) + 1) * 3600) AS ts
+        FROM hourly_stats
+    ),
+    hourly AS (
+        SELECT hour_bucket, api_key, requests, errors
+        FROM hourly_stats
+        WHERE hour_bucket >= :start_bucket
+        UNION ALL
+        SELECT CAST(timestamp / 3600 AS INTEGER), api_key, 1,
+               CASE WHEN status_code >= 400 THEN 1 ELSE 0 END
+        FROM scoring_events
+        WHERE timestamp >= (SELECT ts FROM live_from)
+    )
+"""
+
+_SQL_HOURLY_COUNTS = _SQL_DASHBOARD_WINDOW + """
+    SELECT hour_bucket - :start_bucket AS hour_offset,
+           SUM(requests) AS request_count,
+           SUM(errors) AS error_count
+    FROM hourly
+    GROUP BY hour_bucket
+    ORDER BY hour_bucket
+"""
+
+_SQL_TOP_API_KEYS = _SQL_DASHBOARD_WINDOW + """
+    SELECT api_key, SUM(requests) AS request_count
+    FROM hourly
+    GROUP BY api_key
+    ORDER BY request_count DESC
+    LIMIT 10
+"""
 
 @monitor_router.get("/stats")
 async def get_monitoring_stats(
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_permission("monitor"))
 ) -> Dict[str, Any]:
     """
     Get current monitoring statistics
     
     Requires authentication with monitoring permissions.
     """
-    # Check permissions
-    if "monitor" not in current_user.get("permissions", []):
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    body = _cached_body("stats")
+    if body is None:
+        body = _cache_body("stats", await run_in_threadpool(get_monitor().get_monitoring_stats))
     
-    monitor = get_monitor()
-    return monitor.get_monitoring_stats()
+    return Response(content=body, media_type="application/json")
 
 @monitor_router.get("/alerts")
 async def get_recent_alerts(
     hours: int = Query(24, ge=1, le=168, description="Hours to look back (1-168)"),
     severity: Optional[str] = Query(None, regex="^(low|medium|high|critical)$"),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_permission("monitor"))
 ) -> List[Dict[str, Any]]:
     """
     Get recent anomaly alerts
@@ -48,16 +197,8 @@ async def get_recent_alerts(
         
     Requires authentication with monitoring permissions.
     """
-    # Check permissions
-    if "monitor" not in current_user.get("permissions", []):
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
-    
     monitor = get_monitor()
-    alerts = monitor.get_recent_alerts(hours)
-    
-    # Filter by severity if specified
-    if severity:
-        alerts = [alert for alert in alerts if alert.severity == severity]
+    alerts = await run_in_threadpool(monitor.get_recent_alerts, hours, severity)
     
     # Convert to dict format
     return [
@@ -69,101 +210,112 @@ async def get_recent_alerts(
             "affected_entities": alert.affected_entities,
             "metrics": alert.metrics,
             "recommendations": alert.recommendations,
-            "created_at": datetime.fromtimestamp(alert.timestamp).isoformat()
+            "created_at": datetime.fromtimestamp(alert.timestamp)
         }
         for alert in alerts
     ]
 
 @monitor_router.get("/weekly-summary")
 async def get_weekly_summary(
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_permission("admin"))
 ) -> Dict[str, Any]:
     """
     Generate weekly monitoring summary
     
     Requires authentication with admin permissions.
     """
-    # Check permissions
-    if "admin" not in current_user.get("permissions", []):
-        raise HTTPException(status_code=403, detail="Admin permissions required")
-    
     monitor = get_monitor()
-    return monitor.generate_weekly_summary()
+    return await run_in_threadpool(monitor.generate_weekly_summary)
 
-@monitor_router.get("/events")
+# Optional /events filter conditions, in query parameter order
+_EVENTS_FILTERS = ("user_id = ?", "api_key = ?", "timestamp >= ?", "timestamp <= ?")
+
+# Human-readable local event time, formatted by SQLite rather than per row in Python
+_EVENTS_CREATED_AT_ISO = "strftime('%Y-%m-%dT%H:%M:%f', timestamp, 'unixepoch', 'localtime')"
+
+# /events SQL per combination of filters present. Reusing the exact same
+# string lets each pooled connection's statement cache skip recompiling it
+_events_queries: Dict[Tuple[bool, ...], str] = {}
+
+def _events_query(shape: Tuple[bool, ...]) -> str:
+    """Return the /events query for the filters flagged present in shape"""
+    query = _events_queries.get(shape)
+    if query is None:
+        conditions = "".join(
+            f" AND {condition}" for condition, present in zip(_EVENTS_FILTERS, shape) if present
+        )
+        query = (
+            f"SELECT *, {_EVENTS_CREATED_AT_ISO} AS created_at_iso"
+            f" FROM scoring_events WHERE 1=1{conditions} ORDER BY timestamp DESC LIMIT ?"
+        )
+        _events_queries[shape] = query
+    return query
+
+def _event_to_ndjson(columns: List[str], row: Tuple) -> bytes:
+    """Encode one scoring_events row as an NDJSON line"""
+    event_dict = dict(zip(columns, row))
+    
+    # Parse JSON fields; malformed ones are passed through as text, since
+    # the raw BLOB bytes cannot be encoded and would end the stream
+    for field in ('request_data', 'response_data'):
+        value = event_dict[field]
+        try:
+            event_dict[field] = orjson.loads(value)
+        except orjson.JSONDecodeError:
+            if isinstance(value, bytes):
+                event_dict[field] = value.decode('utf-8', errors='replace')
+    
+    return orjson.dumps(event_dict) + b"\n"
+
+async def _stream_events(stack: AsyncExitStack, cursor: aiosqlite.Cursor, rows: List[Tuple]):
+    """Yield events batch by batch, releasing the pooled connection at the end"""
+    try:
+        columns = [description[0] for description in cursor.description]
+        while rows:
+            for row in rows:
+                yield _event_to_ndjson(columns, row)
+            rows = await cursor.fetchmany(EVENTS_FETCH_SIZE)
+    finally:
+        await stack.aclose()
+
+@monitor_router.get("/events", response_class=StreamingResponse)
 async def get_scoring_events(
     limit: int = Query(100, ge=1, le=1000, description="Number of events to return"),
     user_id: Optional[str] = Query(None, description="Filter by user ID"),
     api_key: Optional[str] = Query(None, description="Filter by API key"),
     start_time: Optional[float] = Query(None, description="Start timestamp"),
     end_time: Optional[float] = Query(None, description="End timestamp"),
-    current_user: dict = Depends(get_current_user)
-) -> List[Dict[str, Any]]:
+    current_user: dict = Depends(require_permission("monitor"))
+) -> StreamingResponse:
     """
     Get scoring events with optional filtering
     
+    Events are streamed as newline-delimited JSON, one event per line.
     Requires authentication with monitoring permissions.
     """
-    # Check permissions
-    if "monitor" not in current_user.get("permissions", []):
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
-    
     monitor = get_monitor()
     
     try:
-        import sqlite3
-        
-        # Build query
-        query = "SELECT * FROM scoring_events WHERE 1=1"
-        params = []
-        
-        if user_id:
-            query += " AND user_id = ?"
-            params.append(user_id)
-        
-        if api_key:
-            query += " AND api_key = ?"
-            params.append(api_key)
+        # Look up the query for the filters given
+        filters = (user_id, api_key, start_time, end_time)
+        query = _events_query(tuple(bool(value) for value in filters))
+        params = [value for value in filters if value]
+        params.append(limit)
         
-        if start_time:
-            query += " AND timestamp >= ?"
-            params.append(start_time)
+        # Execute query; the first batch is fetched here so query errors
+        # still surface as a 500 before streaming starts
+        stack = AsyncExitStack()
+        try:
+            conn = await stack.enter_async_context(get_monitor_pool().connection())
+            cursor = await stack.enter_async_context(conn.execute(query, params))
+            rows = await cursor.fetchmany(EVENTS_FETCH_SIZE)
+        except Exception:
+            await stack.aclose()
+            raise
         
-        if end_time:
-            query += " AND timestamp <= ?"
-            params.append(end_time)
+        return StreamingResponse(_stream_events(stack, cursor, rows),
+                                 media_type="application/x-ndjson")
         
-        query += " ORDER BY timestamp DESC LIMIT ?"
-        params.append(limit)
-        
-        # Execute query
-        with sqlite3.connect(monitor.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            # Get column names
-            columns = [description[0] for description in cursor.description]
-            
-            # Convert to dict format
-            events = []
-            for row in rows:
-                event_dict = dict(zip(columns, row))
-                
-                # Parse JSON fields
-                try:
-                    event_dict['request_data'] = json.loads(event_dict['request_data'])
-                    event_dict['response_data'] = json.loads(event_dict['response_data'])
-                except json.JSONDecodeError:
-                    pass
-                
-                # Add human-readable timestamp
-                event_dict['created_at_iso'] = datetime.fromtimestamp(event_dict['timestamp']).isoformat()
-                
-                events.append(event_dict)
-            
-            return events
-            
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving events: {str(e)}")
 
@@ -178,11 +330,9 @@ async def monitor_health_check() -> Dict[str, Any]:
     
     try:
         # Test database connection
-        import sqlite3
-        with sqlite3.connect(monitor.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM scoring_events")
-            event_count = cursor.fetchone()[0]
+        async with get_monitor_pool().connection() as conn:
+            async with conn.execute("SELECT COUNT(*) FROM scoring_events") as cursor:
+                event_count = (await cursor.fetchone())[0]
         
         return {
             "status": "healthy",
@@ -204,21 +354,18 @@ async def monitor_health_check() -> Dict[str, Any]:
 @monitor_router.post("/cleanup")
 async def cleanup_old_data(
     days_to_keep: int = Query(90, ge=7, le=365, description="Days of data to keep"),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_permission("admin"))
 ) -> Dict[str, Any]:
     """
     Clean up old monitoring data
     
     Requires authentication with admin permissions.
     """
-    # Check permissions
-    if "admin" not in current_user.get("permissions", []):
-        raise HTTPException(status_code=403, detail="Admin permissions required")
-    
     monitor = get_monitor()
     
     try:
-        monitor.cleanup_old_data(days_to_keep)
+        await run_in_threadpool(monitor.cleanup_old_data, days_to_keep)
+        invalidate_response_cache()
         return {
             "status": "success",
             "message": f"Cleaned up data older than {days_to_keep} days",
@@ -229,106 +376,150 @@ async def cleanup_old_data(
 
 @monitor_router.get("/dashboard-data")
 async def get_dashboard_data(
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(require_permission("monitor"))
 ) -> Dict[str, Any]:
     """
     Get comprehensive dashboard data for monitoring UI
     
     Requires authentication with monitoring permissions.
     """
-    # Check permissions
-    if "monitor" not in current_user.get("permissions", []):
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    body = _cached_body("dashboard")
+    if body is not None:
+        return Response(content=body, media_type="application/json")
     
     monitor = get_monitor()
     
     try:
         # Get basic stats
-        stats = monitor.get_monitoring_stats()
+        stats = await run_in_threadpool(monitor.get_monitoring_stats)
         
         # Get recent alerts
-        alerts = monitor.get_recent_alerts(24)
+        alerts = await run_in_threadpool(monitor.get_recent_alerts, 24)
+        severity_counts = Counter(alert.severity for alert in alerts)
         
-        # Get hourly request counts for the last 24 hours
-        import sqlite3
+        # Get hourly request counts for the last 24 hours, in clock hours
         current_time = time.time()
         start_time = current_time - 24 * 3600
+        window = {"start_time": start_time, "start_bucket": int(start_time // 3600)}
         
-        with sqlite3.connect(monitor.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Hourly request counts
-            cursor.execute("""
-                SELECT 
-                    CAST((timestamp - ?) / 3600 AS INTEGER) as hour_offset,
-                    COUNT(*) as request_count
-                FROM scoring_events 
-                WHERE timestamp >= ?
-                GROUP BY hour_offset
-                ORDER BY hour_offset
-            """, (start_time, start_time))
-            
-            hourly_data = cursor.fetchall()
-            
-            # Error counts by hour
-            cursor.execute("""
-                SELECT 
-                    CAST((timestamp - ?) / 3600 AS INTEGER) as hour_offset,
-                    COUNT(*) as error_count
-                FROM scoring_events 
-                WHERE timestamp >= ? AND status_code >= 400
-                GROUP BY hour_offset
-                ORDER BY hour_offset
-            """, (start_time, start_time))
-            
-            hourly_errors = cursor.fetchall()
+        async with get_monitor_pool().connection() as conn:
+            # Hourly request and error counts
+            async with conn.execute(_SQL_HOURLY_COUNTS, window) as cursor:
+                hourly_counts = await cursor.fetchall()
             
             # Top API keys by usage
-            cursor.execute("""
-                SELECT api_key, COUNT(*) as request_count
-                FROM scoring_events 
-                WHERE timestamp >= ?
-                GROUP BY api_key
-                ORDER BY request_count DESC
-                LIMIT 10
-            """, (start_time,))
-            
-            top_api_keys = cursor.fetchall()
+            async with conn.execute(_SQL_TOP_API_KEYS, window) as cursor:
+                top_api_keys = await cursor.fetchall()
         
         # Format dashboard data
         dashboard_data = {
             "overview": stats,
             "alerts": {
                 "total": len(alerts),
-                "critical": len([a for a in alerts if a.severity == "critical"]),
-                "high": len([a for a in alerts if a.severity == "high"]),
+                "critical": severity_counts["critical"],
+                "high": severity_counts["high"],
                 "recent": alerts[:5]  # Last 5 alerts
             },
             "charts": {
-                "hourly_requests": [{"hour": h[0], "requests": h[1]} for h in hourly_data],
-                "hourly_errors": [{"hour": h[0], "errors": h[1]} for h in hourly_errors],
+                "hourly_requests": [{"hour": h[0], "requests": h[1]} for h in hourly_counts],
+                "hourly_errors": [{"hour": h[0], "errors": h[2]} for h in hourly_counts if h[2]],
                 "top_api_keys": [{"api_key": k[0], "requests": k[1]} for k in top_api_keys]
             },
             "timestamp": current_time
         }
         
-        return dashboard_data
+        return Response(content=_cache_body("dashboard", dashboard_data),
+                        media_type="application/json")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating dashboard data: {str(e)}")
 
 # Function to integrate monitoring into main API
+async def _consume_log_queue(queue: asyncio.Queue):
+    """
+    Background task that writes queued scoring events in batches
+    
+    A None on the queue stops the task once the events before it are written.
+    """
+    loop = asyncio.get_running_loop()
+    closing = False
+    while not closing:
+        event = await queue.get()
+        batch = []
+        deadline = loop.time() + LOG_BATCH_WAIT
+        while event is not None:
+            batch.append(event)
+            timeout = deadline - loop.time()
+            if len(batch) >= LOG_BATCH_SIZE or timeout <= 0:
+                break
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+        closing = event is None
+        
+        if batch:
+            try:
+                await run_in_threadpool(get_monitor().log_scoring_events, batch)
+            except Exception as e:
+                logging.error(f"Failed to write {len(batch)} scoring events: {e}")
+
+def enqueue_scoring_event(event: ScoringEvent):
+    """Queue a scoring event for the background writer, dropping it if the queue is full"""
+    global _log_queue, _log_task, dropped_log_events
+    
+    # Created on first use so the queue and task belong to the serving loop
+    if _log_task is None:
+        _log_queue = asyncio.Queue(maxsize=LOG_QUEUE_SIZE)
+        _log_task = asyncio.get_running_loop().create_task(_consume_log_queue(_log_queue))
+    
+    try:
+        _log_queue.put_nowait(event)
+    except asyncio.QueueFull:
+        dropped_log_events += 1
+
+async def close_log_queue():
+    """Stop the background writer once everything queued has been written"""
+    global _log_queue, _log_task
+    
+    if _log_task is None:
+        return
+    
+    await _log_queue.put(None)
+    await _log_task
+    
+    _log_queue = None
+    _log_task = None
+
 def integrate_monitoring_middleware(app):
     """
     Integrate monitoring middleware into FastAPI app
     
     This should be called from the main application to add monitoring to all requests.
+    The app's lifespan is wrapped so close_log_queue() runs on shutdown and
+    events still queued are written.
     """
     from fastapi import Request, Response
     import time
     
+    app_lifespan = app.router.lifespan_context
+    
+    @asynccontextmanager
+    async def lifespan(app):
+        try:
+            async with app_lifespan(app) as state:
+                yield state
+        finally:
+            await close_log_queue()
+    
+    app.router.lifespan_context = lifespan
+    
     @app.middleware("http")
     async def monitoring_middleware(request: Request, call_next):
+        # Only scoring requests are logged; everything else passes straight through
+        if request.method != "POST" or request.url.path != _SCORE_PATH:
+            return await call_next(request)
+        
         start_time = time.time()
         
         # Get request info
@@ -341,38 +532,36 @@ def integrate_monitoring_middleware(app):
         # Calculate processing time
         processing_time = time.time() - start_time
         
-        # Log if this is a scoring request
-        if request.url.path == "/score-user" and request.method == "POST":
-            try:
-                # Get API key from authorization header
-                auth_header = request.headers.get("authorization", "")
-                api_key = auth_header.replace("Bearer ", "") if auth_header.startswith("Bearer ") else "unknown"
-                
-                # Get request body (this is a simplified approach)
-                # In practice, you'd need to capture this during request processing
-                request_data = {}
-                response_data = {}
-                
-                # Extract user_id if available
-                user_id = "unknown"
-                
-                # Log the event
-                from .scoring_monitor import log_scoring_request
-                log_scoring_request(
-                    user_id=user_id,
-                    api_key=api_key,
-                    request_data=request_data,
-                    response_data=response_data,
-                    processing_time=processing_time,
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    status_code=response.status_code
-                )
-                
-            except Exception as e:
-                # Don't let monitoring errors break the main request
-                import logging
-                logging.error(f"Monitoring error: {e}")
+        # Log the scoring request
+        try:
+            # Get API key from authorization header
+            auth_header = request.headers.get("authorization", "")
+            api_key = auth_header[7:] if auth_header.startswith("Bearer ") else "unknown"
+            
+            # Get request body (this is a simplified approach)
+            # In practice, you'd need to capture this during request processing
+            request_data = {}
+            response_data = {}
+            
+            # Extract user_id if available
+            user_id = "unknown"
+            
+            # Queue the event; it is written after the response is sent
+            enqueue_scoring_event(ScoringEvent(
+                timestamp=time.time(),
+                user_id=user_id,
+                api_key=api_key,
+                request_data=request_data,
+                response_data=response_data,
+                processing_time=processing_time,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                status_code=response.status_code
+            ))
+            
+        except Exception as e:
+            # Don't let monitoring errors break the main request
+            logging.error(f"Monitoring error: {e}")
         
         return response
 
@@ -1,9 +1,27 @@
 import json
+import orjson
+from functools import lru_cache
 from fastapi.openapi.utils import get_openapi
 from main_updated import app
 
+# Paths whose GET endpoints are served without authentication
+PUBLIC_PATHS = frozenset({"/health", "/docs", "/redoc", "/openapi.json"})
+
+# Example request body attached to Postman POST/PUT/PATCH requests
+_EXAMPLE_BODY = json.dumps({
+    "user_id": "example_user",
+    "age": 30,
+    "income": 50000,
+    "credit_history_length": 5
+}, indent=2)
+
+@lru_cache(maxsize=1)
 def generate_openapi_schema():
-    """Generate OpenAPI schema for the Kifaa API"""
+    """
+    Generate OpenAPI schema for the Kifaa API
+    
+    The schema is built once and shared by every caller; treat it as read-only.
+    """
     
     openapi_schema = get_openapi(
         title="Kifaa Credit Scoring API",
@@ -86,10 +104,11 @@ def generate_openapi_schema():
     }
     
     # Add security to all endpoints
-    for path in openapi_schema["paths"]:
-        for method in openapi_schema["paths"][path]:
-            if method != "get" or path not in ["/health", "/docs", "/redoc", "/openapi.json"]:
-                openapi_schema["paths"][path][method]["security"] = [{"BearerAuth": []}]
+    for path, methods in openapi_schema["paths"].items():
+        is_public = path in PUBLIC_PATHS
+        for method, spec in methods.items():
+            if method != "get" or not is_public:
+                spec["security"] = [{"BearerAuth": []}]
     
     # Add examples
     openapi_schema["components"]["examples"] = {
@@ -146,14 +165,16 @@ def save_openapi_schema():
     schema = generate_openapi_schema()
     
     # Save as JSON
-    with open("docs/openapi.json", "w") as f:
-        json.dump(schema, f, indent=2)
+    with open("docs/openapi.json", "wb") as f:
+        f.write(orjson.dumps(schema, option=orjson.OPT_INDENT_2))
     
-    # Save as YAML (if PyYAML is available)
+    # Save as YAML (if PyYAML is available), with the libyaml emitter when
+    # PyYAML was built against it
     try:
         import yaml
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
         with open("docs/openapi.yaml", "w") as f:
-            yaml.dump(schema, f, default_flow_style=False)
+            yaml.dump(schema, f, Dumper=dumper, default_flow_style=False)
     except ImportError:
         print("PyYAML not available, skipping YAML export")
     
@@ -201,6 +222,7 @@ def generate_postman_collection():
             "name": path.replace("/", "_").strip("_") or "root",
             "item": []
         }
+        path_parts = path.strip("/").split("/") if path != "/" else []
         
         for method, details in methods.items():
             if method.upper() in ["GET", "POST", "PUT", "DELETE", "PATCH"]:
@@ -218,7 +240,7 @@ def generate_postman_collection():
                         "url": {
                             "raw": "{{base_url}}" + path,
                             "host": ["{{base_url}}"],
-                            "path": path.strip("/").split("/") if path != "/" else []
+                            "path": path_parts
                         },
                         "description": details.get("description", "")
                     }
@@ -234,12 +256,7 @@ def generate_postman_collection():
                                 # Add example body
                                 request["request"]["body"] = {
                                     "mode": "raw",
-                                    "raw": json.dumps({
-                                        "user_id": "example_user",
-                                        "age": 30,
-                                        "income": 50000,
-                                        "credit_history_length": 5
-                                    }, indent=2),
+                                    "raw": _EXAMPLE_BODY,
                                     "options": {
                                         "raw": {
                                             "language": "json"
@@ -253,8 +270,8 @@ def generate_postman_collection():
             collection["item"].append(folder)
     
     # Save Postman collection
-    with open("docs/kifaa_api.postman_collection.json", "w") as f:
-        json.dump(collection, f, indent=2)
+    with open("docs/kifaa_api.postman_collection.json", "wb") as f:
+        f.write(orjson.dumps(collection, option=orjson.OPT_INDENT_2))
     
     print("Postman collection saved to docs/kifaa_api.postman_collection.json")
 
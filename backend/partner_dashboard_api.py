@@ -8,12 +8,20 @@ including score management, user management, and approval workflows.
 
 from fastapi import APIRouter, HTTPException, Depends, Query, status
 from pydantic import BaseModel
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import sqlite3
-import json
+import orjson
 import time
 import logging
+import threading
 from datetime import datetime, timedelta
+from types import SimpleNamespace
+from cachetools import TTLCache
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
 from auth import get_current_user
 from scoring_monitor import get_monitor
@@ -23,6 +31,9 @@ from model_manager import get_model_manager
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds a partner's dashboard stats are reused before being recomputed
+STATS_CACHE_TTL = 30
+
 # Create router for partner dashboard endpoints
 dashboard_router = APIRouter(prefix="/dashboard", tags=["partner_dashboard"])
 
@@ -60,12 +71,53 @@ class DashboardStats(BaseModel):
     pending_approvals: int
     active_users: int
 
+if msgspec is not None:
+    class ListedRequestFields(msgspec.Struct):
+        """Request fields shown in score listings; other fields are skipped"""
+        age: Any = None
+        income: Any = None
+        region: Any = None
+    
+    class ListedResponseFields(msgspec.Struct):
+        """Response fields shown in score listings; other fields are skipped"""
+        credit_score: Any = None
+        score_range: Any = None
+        model_version: Any = None
+    
+    _LISTED_REQUEST_DECODER = msgspec.json.Decoder(ListedRequestFields)
+    _LISTED_RESPONSE_DECODER = msgspec.json.Decoder(ListedResponseFields)
+    _LISTING_DECODE_ERRORS = (msgspec.DecodeError,)
+else:
+    _LISTING_DECODE_ERRORS = (orjson.JSONDecodeError,)
+
+def _decode_listing_fields(request_data, response_data) -> Tuple[Any, Any]:
+    """Decode the stored request and response fields shown in score listings
+    
+    Returns objects exposing the listed fields as attributes. Uses msgspec
+    when installed so unused fields are never materialized.
+    """
+    if msgspec is None:
+        request, response = orjson.loads(request_data), orjson.loads(response_data)
+        return (
+            SimpleNamespace(age=request.get("age"), income=request.get("income"),
+                            region=request.get("region")),
+            SimpleNamespace(credit_score=response.get("credit_score"),
+                            score_range=response.get("score_range"),
+                            model_version=response.get("model_version"))
+        )
+    
+    return _LISTED_REQUEST_DECODER.decode(request_data), _LISTED_RESPONSE_DECODER.decode(response_data)
+
 class PartnerDashboardManager:
     """Manager for partner dashboard data and operations"""
     
     def __init__(self, db_path: str = "data/partner_dashboard.db"):
         self.db_path = db_path
         self._init_database()
+        
+        # Dashboard stats per partner; dropped when the partner records a decision
+        self._stats_cache = TTLCache(maxsize=1024, ttl=STATS_CACHE_TTL)
+        self._stats_cache_lock = threading.Lock()
     
     def _init_database(self):
         """Initialize partner dashboard database"""
@@ -152,11 +204,11 @@ class PartnerDashboardManager:
                 
                 # Add score range filter
                 if filters and filters.min_score is not None:
-                    query += " AND JSON_EXTRACT(response_data, '$.credit_score') >= ?"
+                    query += " AND credit_score >= ?"
                     params.append(filters.min_score)
                 
                 if filters and filters.max_score is not None:
-                    query += " AND JSON_EXTRACT(response_data, '$.credit_score') <= ?"
+                    query += " AND credit_score <= ?"
                     params.append(filters.max_score)
                 
                 # Add date filters
@@ -179,25 +231,24 @@ class PartnerDashboardManager:
                 scores = []
                 for row in rows:
                     try:
-                        request_data = json.loads(row[1])
-                        response_data = json.loads(row[2])
+                        request_fields, response_fields = _decode_listing_fields(row[1], row[2])
                         
                         scores.append({
                             "user_id": row[0],
-                            "credit_score": response_data.get("credit_score"),
-                            "score_range": response_data.get("score_range"),
-                            "model_version": response_data.get("model_version"),
+                            "credit_score": response_fields.credit_score,
+                            "score_range": response_fields.score_range,
+                            "model_version": response_fields.model_version,
                             "timestamp": row[3],
                             "date": datetime.fromtimestamp(row[3]).isoformat(),
                             "processing_time": row[4],
                             "status": "success" if row[5] == 200 else "error",
                             "user_data": {
-                                "age": request_data.get("age"),
-                                "income": request_data.get("income"),
-                                "region": request_data.get("region")
+                                "age": request_fields.age,
+                                "income": request_fields.income,
+                                "region": request_fields.region
                             }
                         })
-                    except json.JSONDecodeError:
+                    except _LISTING_DECODE_ERRORS:
                         continue
                 
                 return scores
@@ -227,34 +278,29 @@ class PartnerDashboardManager:
                 if not row:
                     return None
                 
-                request_data = json.loads(row[0])
-                response_data = json.loads(row[1])
+                request_data = orjson.loads(row[0])
+                response_data = orjson.loads(row[1])
                 
                 # Get approval status
                 approval_status = self._get_approval_status(user_id, partner_id)
                 
-                # Get scoring history
+                # Get scoring history from the credit_score column
                 cursor.execute("""
-                    SELECT response_data, timestamp
+                    SELECT credit_score, timestamp
                     FROM scoring_events 
                     WHERE user_id = ?
                     ORDER BY timestamp DESC 
                     LIMIT 10
                 """, (user_id,))
                 
-                history_rows = cursor.fetchall()
-                score_history = []
-                
-                for hist_row in history_rows:
-                    try:
-                        hist_response = json.loads(hist_row[0])
-                        score_history.append({
-                            "credit_score": hist_response.get("credit_score"),
-                            "timestamp": hist_row[1],
-                            "date": datetime.fromtimestamp(hist_row[1]).isoformat()
-                        })
-                    except json.JSONDecodeError:
-                        continue
+                score_history = [
+                    {
+                        "credit_score": hist_row[0],
+                        "timestamp": hist_row[1],
+                        "date": datetime.fromtimestamp(hist_row[1]).isoformat()
+                    }
+                    for hist_row in cursor.fetchall()
+                ]
                 
                 return {
                     "user_id": user_id,
@@ -316,7 +362,7 @@ class PartnerDashboardManager:
             if not row:
                 raise ValueError("No scoring data found for user")
             
-            response_data = json.loads(row[0])
+            response_data = orjson.loads(row[0])
             credit_score = response_data.get("credit_score", 0)
         
         # Store approval decision
@@ -340,6 +386,8 @@ class PartnerDashboardManager:
         # Update partner statistics
         self._update_partner_stats(partner_id, approval_data.decision, credit_score,
                                  approval_data.credit_limit or 0)
+        with self._stats_cache_lock:
+            self._stats_cache.pop(partner_id, None)
         
         return UserApprovalResponse(
             user_id=user_id,
@@ -357,73 +405,49 @@ class PartnerDashboardManager:
         """Update partner statistics"""
         today = datetime.now().date()
         
+        # One atomic upsert; SET expressions read the row as it was before
+        # this update, so the running average folds in the new score
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Get or create today's stats
-            cursor.execute("""
-                SELECT total_scores, total_approvals, total_rejections, 
-                       avg_score, total_credit_issued
-                FROM partner_stats 
-                WHERE partner_id = ? AND date = ?
-            """, (partner_id, today))
-            
-            row = cursor.fetchone()
-            
-            if row:
-                # Update existing stats
-                total_scores = row[0] + 1
-                total_approvals = row[1] + (1 if decision == "approve" else 0)
-                total_rejections = row[2] + (1 if decision == "reject" else 0)
-                avg_score = (row[3] * row[0] + credit_score) / total_scores
-                total_credit_issued = row[4] + (credit_amount if decision == "approve" else 0)
-                
-                cursor.execute("""
-                    UPDATE partner_stats 
-                    SET total_scores = ?, total_approvals = ?, total_rejections = ?,
-                        avg_score = ?, total_credit_issued = ?
-                    WHERE partner_id = ? AND date = ?
-                """, (total_scores, total_approvals, total_rejections,
-                     avg_score, total_credit_issued, partner_id, today))
-            else:
-                # Create new stats
-                cursor.execute("""
-                    INSERT INTO partner_stats 
-                    (partner_id, date, total_scores, total_approvals, total_rejections,
-                     avg_score, total_credit_issued)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (partner_id, today, 1,
-                     1 if decision == "approve" else 0,
-                     1 if decision == "reject" else 0,
-                     credit_score,
-                     credit_amount if decision == "approve" else 0))
-            
-            conn.commit()
+            conn.execute("""
+                INSERT INTO partner_stats 
+                (partner_id, date, total_scores, total_approvals, total_rejections,
+                 avg_score, total_credit_issued)
+                VALUES (?, ?, 1, ?, ?, ?, ?)
+                ON CONFLICT (partner_id, date) DO UPDATE SET
+                    total_scores = total_scores + 1,
+                    total_approvals = total_approvals + excluded.total_approvals,
+                    total_rejections = total_rejections + excluded.total_rejections,
+                    avg_score = (avg_score * total_scores + excluded.avg_score) / (total_scores + 1),
+                    total_credit_issued = total_credit_issued + excluded.total_credit_issued
+            """, (partner_id, today,
+                 1 if decision == "approve" else 0,
+                 1 if decision == "reject" else 0,
+                 credit_score,
+                 credit_amount if decision == "approve" else 0))
     
     def get_dashboard_stats(self, partner_id: str) -> DashboardStats:
-        """Get dashboard statistics for partner"""
+        """Get dashboard statistics for partner, cached for STATS_CACHE_TTL seconds"""
+        with self._stats_cache_lock:
+            cached = self._stats_cache.get(partner_id)
+        if cached is not None:
+            return cached
+        
         monitor = get_monitor()
         
         # Get scoring stats from monitor
         with sqlite3.connect(monitor.db_path) as conn:
             cursor = conn.cursor()
             
-            # Total scores
-            cursor.execute("SELECT COUNT(*) FROM scoring_events")
-            total_scores = cursor.fetchone()[0]
-            
-            # Scores today
-            today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
-            cursor.execute("SELECT COUNT(*) FROM scoring_events WHERE timestamp >= ?", (today_start,))
-            scores_today = cursor.fetchone()[0]
-            
-            # Average score
+            # Total scores, scores today and the average score, summed from
+            # the monitor's daily totals
+            today = datetime.now().date().isoformat()
             cursor.execute("""
-                SELECT AVG(CAST(JSON_EXTRACT(response_data, '$.credit_score') AS REAL))
-                FROM scoring_events 
-                WHERE JSON_EXTRACT(response_data, '$.credit_score') IS NOT NULL
-            """)
-            avg_score_result = cursor.fetchone()[0]
+                SELECT COALESCE(SUM(events), 0),
+                       COALESCE(SUM(CASE WHEN day = ? THEN events END), 0),
+                       SUM(score_sum) / NULLIF(SUM(scored), 0)
+                FROM daily_scores
+            """, (today,))
+            total_scores, scores_today, avg_score_result = cursor.fetchone()
             avg_score = avg_score_result if avg_score_result else 0
         
         # Get approval stats from dashboard DB
@@ -458,7 +482,7 @@ class PartnerDashboardManager:
             """, (partner_id,))
             active_users = cursor.fetchone()[0]
         
-        return DashboardStats(
+        stats = DashboardStats(
             total_scores=total_scores,
             scores_today=scores_today,
             avg_score=avg_score,
@@ -466,6 +490,11 @@ class PartnerDashboardManager:
             pending_approvals=pending_approvals,
             active_users=active_users
         )
+        
+        with self._stats_cache_lock:
+            self._stats_cache[partner_id] = stats
+        
+        return stats
 
 # Global dashboard manager
 _dashboard_manager = None
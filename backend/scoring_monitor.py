@@ -7,6 +7,7 @@ It logs every /score-user call, detects anomalies, and provides intelligent insi
 """
 
 import json
+import orjson
 import time
 import logging
 import sqlite3
@@ -23,6 +24,37 @@ from pathlib import Path
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds between hourly_stats rollups
+ROLLUP_INTERVAL = 300
+
+# Re-aggregates whole hours of raw events into hourly_stats; rerunning it
+# over an already rolled hour replaces that hour's counts
+_SQL_ROLLUP_HOURLY = """
+    INSERT INTO hourly_stats (hour_bucket, api_key, requests, errors)
+    SELECT CAST(timestamp / 3600 AS INTEGER) AS hour_bucket, api_key,
+           COUNT(*), SUM(CASE WHEN status_code >= 400 THEN 1 ELSE 0 END)
+    FROM scoring_events
+    WHERE timestamp >= ? AND timestamp < ?
+    GROUP BY hour_bucket, api_key
+    ON CONFLICT (hour_bucket, api_key) DO UPDATE SET
+        requests = excluded.requests,
+        errors = excluded.errors
+"""
+
+# Credit score of an event as stored in its response; used to backfill the
+# credit_score column of events written before it existed
+CREDIT_SCORE_EXPR = "CAST(JSON_EXTRACT(response_data, '$.credit_score') AS REAL)"
+
+# Adds a batch's events and credit scores to the running daily totals
+_SQL_COUNT_DAILY_SCORES = """
+    INSERT INTO daily_scores (day, events, scored, score_sum)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (day) DO UPDATE SET
+        events = events + excluded.events,
+        scored = scored + excluded.scored,
+        score_sum = score_sum + excluded.score_sum
+"""
+
 @dataclass
 class ScoringEvent:
     """Represents a single scoring event"""
@@ -99,17 +131,27 @@ class ScoringMonitor:
                     timestamp REAL NOT NULL,
                     user_id TEXT NOT NULL,
                     api_key TEXT NOT NULL,
-                    request_data TEXT NOT NULL,
-                    response_data TEXT NOT NULL,
+                    request_data BLOB NOT NULL,
+                    response_data BLOB NOT NULL,
                     processing_time REAL NOT NULL,
                     ip_address TEXT NOT NULL,
                     user_agent TEXT NOT NULL,
                     status_code INTEGER NOT NULL,
                     error_message TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    credit_score REAL
                 )
             """)
             
+            # The credit score is copied out of response_data so dashboards
+            # can filter and aggregate it without parsing JSON
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(scoring_events)")}
+            if "credit_score" not in columns:
+                cursor.execute("ALTER TABLE scoring_events ADD COLUMN credit_score REAL")
+                # JSON_EXTRACT raises on malformed JSON; those rows keep NULL
+                cursor.execute(f"UPDATE scoring_events SET credit_score = {CREDIT_SCORE_EXPR} "
+                               "WHERE json_valid(response_data)")
+            
             # Create anomaly alerts table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS anomaly_alerts (
@@ -125,11 +167,62 @@ class ScoringMonitor:
                 )
             """)
             
-            # Create indexes for performance
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_timestamp ON scoring_events(timestamp)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_user_id ON scoring_events(user_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_api_key ON scoring_events(api_key)")
+            # Hourly request/error counts per API key, rolled up from
+            # scoring_events so dashboards read 24 buckets instead of raw events
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS hourly_stats (
+                    hour_bucket INTEGER NOT NULL,
+                    api_key TEXT NOT NULL,
+                    requests INTEGER NOT NULL,
+                    errors INTEGER NOT NULL,
+                    PRIMARY KEY (hour_bucket, api_key)
+                )
+            """)
+            
+            # Events and credit score totals per local calendar day, counted as
+            # events are written so dashboards sum days instead of scanning
+            # events. Totals are backfilled from existing events when new
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_scores'")
+            backfill_daily_scores = cursor.fetchone() is None
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS daily_scores (
+                    day TEXT PRIMARY KEY,
+                    events INTEGER NOT NULL,
+                    scored INTEGER NOT NULL,
+                    score_sum REAL NOT NULL
+                ) WITHOUT ROWID
+            """)
+            if backfill_daily_scores:
+                cursor.execute("""
+                    INSERT INTO daily_scores (day, events, scored, score_sum)
+                    SELECT date(timestamp, 'unixepoch', 'localtime') AS day, COUNT(*),
+                           COUNT(credit_score), COALESCE(SUM(credit_score), 0)
+                    FROM scoring_events
+                    GROUP BY day
+                """)
+            
+            # Create indexes for performance. The dashboard filters on the
+            # timestamp window and reads status_code/api_key from the index;
+            # /events filters by user or key and orders by time
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_ts_status ON scoring_events(timestamp DESC, status_code)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_ts_api ON scoring_events(timestamp DESC, api_key)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_user_ts ON scoring_events(user_id, timestamp DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_api_ts ON scoring_events(api_key, timestamp DESC)")
+            
+            # Single-column indexes superseded by the composites above
+            cursor.execute("DROP INDEX IF EXISTS idx_events_timestamp")
+            cursor.execute("DROP INDEX IF EXISTS idx_events_user_id")
+            cursor.execute("DROP INDEX IF EXISTS idx_events_api_key")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_timestamp ON anomaly_alerts(timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_severity_ts ON anomaly_alerts(severity, timestamp)")
+            
+            # Partner dashboards filter and average on the credit score.
+            # Gather planner statistics the first time the index is built
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_events_score'")
+            analyze_credit_score = cursor.fetchone() is None
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_score ON scoring_events(credit_score)")
+            if analyze_credit_score:
+                cursor.execute("ANALYZE scoring_events")
             
             conn.commit()
     
@@ -195,51 +288,71 @@ class ScoringMonitor:
     
     def log_scoring_event(self, event: ScoringEvent):
         """Log a scoring event and perform real-time analysis"""
+        self.log_scoring_events([event])
+    
+    def log_scoring_events(self, events: List[ScoringEvent]):
+        """Log a batch of scoring events, persisting them in one transaction"""
         with self.lock:
-            # Add to sliding windows
-            self.recent_events.append(event)
-            
-            # Extract score if available
-            if event.response_data and 'credit_score' in event.response_data:
-                self.recent_scores.append(event.response_data['credit_score'])
-            
-            self.recent_response_times.append(event.processing_time)
-            
-            # Update request counters
-            self.user_request_counts[event.user_id] += 1
-            self.ip_request_counts[event.ip_address] += 1
+            for event in events:
+                # Add to sliding windows
+                self.recent_events.append(event)
+                
+                # Extract score if available
+                if event.response_data and 'credit_score' in event.response_data:
+                    self.recent_scores.append(event.response_data['credit_score'])
+                
+                self.recent_response_times.append(event.processing_time)
+                
+                # Update request counters
+                self.user_request_counts[event.user_id] += 1
+                self.ip_request_counts[event.ip_address] += 1
+                
+                # Perform anomaly detection
+                self._detect_anomalies(event)
             
             # Persist to database
-            self._persist_event(event)
-            
-            # Perform anomaly detection
-            self._detect_anomalies(event)
+            self._persist_events(events)
     
-    def _persist_event(self, event: ScoringEvent):
-        """Persist event to database"""
+    def _persist_events(self, events: List[ScoringEvent]):
+        """Persist events to database"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
+                cursor.executemany("""
                     INSERT INTO scoring_events 
                     (timestamp, user_id, api_key, request_data, response_data, 
-                     processing_time, ip_address, user_agent, status_code, error_message)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+                     processing_time, ip_address, user_agent, status_code, error_message,
+                     credit_score)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [(
                     event.timestamp,
                     event.user_id,
                     event.api_key,
-                    json.dumps(event.request_data),
-                    json.dumps(event.response_data),
+                    orjson.dumps(event.request_data),
+                    orjson.dumps(event.response_data),
                     event.processing_time,
                     event.ip_address,
                     event.user_agent,
                     event.status_code,
-                    event.error_message
-                ))
+                    event.error_message,
+                    event.response_data.get('credit_score') if event.response_data else None
+                ) for event in events])
+                
+                # Count the batch towards each day's totals
+                daily_totals = defaultdict(lambda: [0, 0, 0.0])
+                for event in events:
+                    totals = daily_totals[datetime.fromtimestamp(event.timestamp).date().isoformat()]
+                    totals[0] += 1
+                    score = event.response_data.get('credit_score') if event.response_data else None
+                    if isinstance(score, (int, float)):
+                        totals[1] += 1
+                        totals[2] += score
+                cursor.executemany(_SQL_COUNT_DAILY_SCORES, [
+                    (day, *totals) for day, totals in daily_totals.items()
+                ])
                 conn.commit()
         except Exception as e:
-            logger.error(f"Error persisting event: {e}")
+            logger.error(f"Error persisting {len(events)} events: {e}")
     
     def _detect_anomalies(self, event: ScoringEvent):
         """Detect anomalies in real-time"""
@@ -465,10 +578,43 @@ class ScoringMonitor:
         cutoff_time = time.time() - 24 * 3600  # 24 hours
         self.alerts = [a for a in self.alerts if a.timestamp > cutoff_time]
     
-    def get_recent_alerts(self, hours: int = 24) -> List[AnomalyAlert]:
-        """Get recent alerts"""
+    def get_recent_alerts(self, hours: int = 24, severity: Optional[str] = None) -> List[AnomalyAlert]:
+        """Get recent alerts, optionally only those of the given severity"""
         cutoff_time = time.time() - hours * 3600
-        return [alert for alert in self.alerts if alert.timestamp > cutoff_time]
+        
+        query = """
+            SELECT timestamp, alert_type, severity, description,
+                   affected_entities, metrics, recommendations
+            FROM anomaly_alerts
+            WHERE timestamp > ?
+        """
+        params = [cutoff_time]
+        
+        if severity:
+            query += " AND severity = ?"
+            params.append(severity)
+        
+        query += " ORDER BY timestamp"
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute(query, params).fetchall()
+        except Exception as e:
+            logger.error(f"Error loading alerts: {e}")
+            return []
+        
+        return [
+            AnomalyAlert(
+                timestamp=row[0],
+                alert_type=row[1],
+                severity=row[2],
+                description=row[3],
+                affected_entities=orjson.loads(row[4]),
+                metrics=orjson.loads(row[5]),
+                recommendations=orjson.loads(row[6])
+            )
+            for row in rows
+        ]
     
     def get_monitoring_stats(self) -> Dict[str, Any]:
         """Get current monitoring statistics"""
@@ -478,6 +624,10 @@ class ScoringMonitor:
         recent_events = [e for e in self.recent_events 
                         if e.timestamp > current_time - 3600]
         
+        # One alert query serves both the 24 hour count and the health check
+        alerts_last_24h = self.get_recent_alerts(24)
+        alerts_last_hour = [a for a in alerts_last_24h if a.timestamp > current_time - 3600]
+        
         # Calculate metrics
         stats = {
             "timestamp": current_time,
@@ -485,7 +635,7 @@ class ScoringMonitor:
             "events_last_hour": len(recent_events),
             "baseline_metrics": self.baseline_metrics,
             "current_metrics": {},
-            "alerts_last_24h": len(self.get_recent_alerts(24)),
+            "alerts_last_24h": len(alerts_last_24h),
             "system_health": "healthy"
         }
         
@@ -502,14 +652,14 @@ class ScoringMonitor:
             stats["current_metrics"]["error_rate"] = len(error_events) / len(recent_events)
         
         # Determine system health
-        critical_alerts = [a for a in self.get_recent_alerts(1) if a.severity == "critical"]
-        high_alerts = [a for a in self.get_recent_alerts(1) if a.severity == "high"]
+        critical_alerts = [a for a in alerts_last_hour if a.severity == "critical"]
+        high_alerts = [a for a in alerts_last_hour if a.severity == "high"]
         
         if critical_alerts:
             stats["system_health"] = "critical"
         elif high_alerts:
             stats["system_health"] = "degraded"
-        elif len(self.get_recent_alerts(1)) > 5:
+        elif len(alerts_last_hour) > 5:
             stats["system_health"] = "warning"
         
         return stats
@@ -679,6 +829,23 @@ class ScoringMonitor:
         
         return recommendations
     
+    def rollup_hourly(self):
+        """
+        Aggregate completed hours of scoring events into hourly_stats
+        
+        The most recently rolled hour is aggregated again so events written
+        late for it are picked up.
+        """
+        current_bucket = int(time.time() // 3600)
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                last_bucket = conn.execute("SELECT MAX(hour_bucket) FROM hourly_stats").fetchone()[0]
+                since = (last_bucket or 0) * 3600
+                conn.execute(_SQL_ROLLUP_HOURLY, (since, current_bucket * 3600))
+        except Exception as e:
+            logger.error(f"Error rolling up hourly stats: {e}")
+    
     def cleanup_old_data(self, days_to_keep: int = 90):
         """Clean up old data from database"""
         cutoff_time = time.time() - days_to_keep * 24 * 3600
@@ -695,6 +862,10 @@ class ScoringMonitor:
                 cursor.execute("DELETE FROM anomaly_alerts WHERE timestamp < ?", (cutoff_time,))
                 alerts_deleted = cursor.rowcount
                 
+                # Delete rollups of the deleted hours
+                cursor.execute("DELETE FROM hourly_stats WHERE hour_bucket < ?", (int(cutoff_time // 3600),))
+                cursor.execute("DELETE FROM daily_scores WHERE day < date(?, 'unixepoch', 'localtime')", (cutoff_time,))
+                
                 conn.commit()
                 
                 logger.info(f"Cleanup completed: {events_deleted} events, {alerts_deleted} alerts deleted")
@@ -733,3 +904,25 @@ def log_scoring_request(user_id: str, api_key: str, request_data: Dict[str, Any]
     monitor = get_monitor()
     monitor.log_scoring_event(event)
 
+def log_scoring_requests(records: List[Dict[str, Any]]):
+    """Convenience function to log a batch of scoring requests in one write"""
+    # Records carry the time they were served; only fill in the rest
+    now = time.time()
+    events = [
+        ScoringEvent(
+            timestamp=record.get("timestamp", now),
+            user_id=record["user_id"],
+            api_key=record["api_key"],
+            request_data=record["request_data"],
+            response_data=record["response_data"],
+            processing_time=record["processing_time"],
+            ip_address=record["ip_address"],
+            user_agent=record["user_agent"],
+            status_code=record["status_code"],
+            error_message=record.get("error_message")
+        )
+        for record in records
+    ]
+    
+    monitor = get_monitor()
+    monitor.log_scoring_events(events)
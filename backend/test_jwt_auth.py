@@ -0,0 +1,150 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+import jwt_auth
+from jwt_auth import JWTAuthManager
+
+class TestJWTVerification:
+    """Test suite for JWT token verification"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.manager = JWTAuthManager(secret_key="test-secret")
+        self.token = self.manager.generate_jwt_token("kifaa_partner_001")
+
+    def test_verify_valid_token(self):
+        """Test that a freshly issued token verifies"""
+        payload = self.manager.verify_jwt_token(self.token)
+
+        assert payload is not None
+        assert payload["api_key"] == "kifaa_partner_001"
+        assert "score_user" in payload["permissions"]
+
+    def test_verify_cached_token_skips_decode(self):
+        """Test that repeated verification is served from the cache"""
+        first = self.manager.verify_jwt_token(self.token)
+
+        with patch.object(self.manager._jwt, "decode", side_effect=AssertionError("decode called")):
+            second = self.manager.verify_jwt_token(self.token)
+
+        assert second == first
+
+    def test_revoke_evicts_cached_token(self):
+        """Test that revoking an API key invalidates cached tokens"""
+        assert self.manager.verify_jwt_token(self.token) is not None
+
+        assert self.manager.revoke_api_key("kifaa_partner_001")
+        assert self.manager.verify_jwt_token(self.token) is None
+
+    def test_verify_invalid_token(self):
+        """Test that tampered tokens are rejected"""
+        assert self.manager.verify_jwt_token(self.token + "x") is None
+
+class TestRateLimiting:
+    """Test suite for sliding-window rate limiting"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.manager = JWTAuthManager(secret_key="test-secret")
+
+    def test_requests_within_limit_allowed(self):
+        """Test that requests under the limit are allowed"""
+        for i in range(5):
+            result = self.manager.check_rate_limit("client", limit=5)
+            assert result["allowed"]
+            assert result["remaining"] == 5 - i - 1
+
+    def test_request_over_limit_rejected(self):
+        """Test that the request after the limit is rejected"""
+        for _ in range(3):
+            self.manager.check_rate_limit("client", limit=3)
+
+        result = self.manager.check_rate_limit("client", limit=3)
+        assert not result["allowed"]
+        assert result["retry_after"] > 0
+
+    def test_previous_window_is_weighted(self):
+        """Test that the previous window still counts toward the limit"""
+        with patch.object(jwt_auth.time, "time", return_value=3600 * 10 + 1):
+            for _ in range(10):
+                self.manager.check_rate_limit("client", limit=10)
+
+        # Early in the next window almost all of the previous count overlaps
+        with patch.object(jwt_auth.time, "time", return_value=3600 * 11 + 60):
+            assert self.manager.check_rate_limit("client", limit=10)["allowed"]
+            assert not self.manager.check_rate_limit("client", limit=10)["allowed"]
+
+        # Two windows later the old requests have fallen out entirely
+        with patch.object(jwt_auth.time, "time", return_value=3600 * 13):
+            assert self.manager.check_rate_limit("client", limit=10)["allowed"]
+
+class TestUsageTracking:
+    """Test suite for batched API key usage statistics"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.manager = JWTAuthManager(secret_key="test-secret")
+
+    def test_usage_is_merged_on_flush(self):
+        """Test that usage counts reach api_keys once flushed"""
+        for _ in range(3):
+            self.manager.verify_api_key("kifaa_partner_001")
+
+        key_info = self.manager.api_keys["kifaa_partner_001"]
+        assert key_info.usage_count == 0
+
+        self.manager.flush_usage()
+        assert key_info.usage_count == 3
+        assert key_info.last_used is not None
+
+    def test_flush_skips_revoked_keys(self):
+        """Test that pending usage for revoked keys is discarded"""
+        self.manager.verify_api_key("kifaa_ussd_001")
+        self.manager.revoke_api_key("kifaa_ussd_001")
+
+        self.manager.flush_usage()
+        assert "kifaa_ussd_001" not in self.manager.api_keys
+
+class TestRequireAuth:
+    """Test suite for the require_auth decorator responses"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        from flask import Flask
+
+        app = Flask(__name__)
+
+        @app.route('/protected')
+        @jwt_auth.require_auth(["admin"])
+        def protected():
+            return {"ok": True}
+
+        self.client = app.test_client()
+
+    def test_missing_credentials_returns_401(self):
+        """Test the pre-encoded authentication error body"""
+        response = self.client.get('/protected')
+
+        assert response.status_code == 401
+        assert response.get_json()["error"] == "Authentication required"
+
+    def test_insufficient_permissions_returns_403(self):
+        """Test that keys without a required permission are rejected"""
+        response = self.client.get('/protected', headers={'Authorization': 'ApiKey kifaa_partner_001'})
+
+        assert response.status_code == 403
+        assert response.get_json()["required"] == ["admin"]
+
+    def test_rate_limited_returns_429(self):
+        """Test the templated rate limit error body"""
+        with patch.object(jwt_auth.auth_manager, "check_rate_limit",
+                          return_value={"allowed": False, "limit": 100, "retry_after": 42}):
+            response = self.client.get('/protected', headers={'Authorization': 'ApiKey kifaa_admin_001'})
+
+        assert response.status_code == 429
+        assert response.get_json() == {"error": "Rate limit exceeded", "limit": 100, "retry_after": 42}
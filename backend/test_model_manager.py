@@ -0,0 +1,278 @@
+import pytest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from model_manager import ModelManager, ModelMetadata
+
+def make_metadata(version: str = "", notes: str = "") -> ModelMetadata:
+    """Build metadata with fixed training results"""
+    return ModelMetadata(
+        version=version,
+        train_date="2024-01-01",
+        accuracy=0.9,
+        precision=0.8,
+        recall=0.7,
+        f1_score=0.75,
+        auc_score=0.85,
+        training_samples=1000,
+        feature_count=3,
+        model_type="TestModel",
+        hyperparameters={"depth": 3},
+        training_duration=1.5,
+        data_hash="data",
+        model_hash="",
+        validation_score=0.88,
+        cross_validation_scores=[0.87, 0.89],
+        feature_importance={"age": 0.5, "income": 0.3, "debt": 0.2},
+        created_by="tests",
+        notes=notes
+    )
+
+class TestModelManager:
+    """Test suite for model versioning and metadata storage"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.manager = ModelManager(
+            models_dir=os.path.join(self.tmp_dir, "models"),
+            metadata_db=os.path.join(self.tmp_dir, "data", "model_metadata.db")
+        )
+
+    def teardown_method(self):
+        """Remove the temporary model store"""
+        self.manager.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_save_and_load_model(self):
+        """Test that a saved model round-trips with its metadata"""
+        version = self.manager.save_model({"weights": [1, 2, 3]}, make_metadata())
+
+        model, metadata = self.manager.load_model_by_version(version)
+
+        assert model == {"weights": [1, 2, 3]}
+        assert metadata.precision == 0.8
+        assert metadata.feature_importance["age"] == 0.5
+        assert metadata.model_hash not in ("", "unknown")
+
+    def test_model_format_recorded(self):
+        """Test that the serialization format is chosen and stored"""
+        version = self.manager.save_model({"n": 1}, make_metadata())
+
+        assert self.manager.get_model_metadata(version).model_format == "pickle"
+
+        metadata = make_metadata()
+        metadata.model_format = "json"
+        with pytest.raises(ValueError):
+            self.manager.save_model({"n": 2}, metadata)
+
+    def test_sklearn_model_round_trips(self):
+        """Test that an estimator outside the skops allowlist can still be loaded"""
+        from sklearn.linear_model import LogisticRegression
+
+        estimator = LogisticRegression().fit([[0.0], [1.0], [2.0], [3.0]], [0, 0, 1, 1])
+        version = self.manager.save_model(estimator, make_metadata())
+
+        model, metadata = self.manager.load_model_by_version(version)
+
+        assert metadata.model_format in ("pickle", "skops")
+        assert list(model.predict([[0.0], [3.0]])) == [0, 1]
+
+    def test_untrusted_skops_types_fall_back_to_pickle(self, monkeypatch):
+        """Test that a model skops would refuse on load is saved as a pickle"""
+        import types
+        import model_manager
+
+        fake_skops = types.SimpleNamespace(
+            dumps=lambda model, compression=None: b"PK\x03\x04",
+            get_untrusted_types=lambda data=None: ["sklearn.linear_model._logistic.LogisticRegression"]
+        )
+        monkeypatch.setattr(model_manager, "skops_io", fake_skops)
+        monkeypatch.setattr(self.manager, "_default_format", lambda model: "skops")
+
+        version = self.manager.save_model({"n": 1}, make_metadata())
+        model, metadata = self.manager.load_model_by_version(version)
+        assert metadata.model_format == "pickle"
+        assert model == {"n": 1}
+
+        metadata = make_metadata()
+        metadata.model_format = "skops"
+        with pytest.raises(ValueError):
+            self.manager.save_model({"n": 2}, metadata)
+
+    def test_top_features(self):
+        """Test that feature importance is ranked in SQL"""
+        version = self.manager.save_model({"n": 1}, make_metadata())
+
+        assert self.manager.get_top_features(version, limit=2) == [("age", 0.5), ("income", 0.3)]
+
+    def test_versions_increment_per_day(self):
+        """Test that versions saved on the same day get increasing sequence numbers"""
+        first = self.manager.save_model({"n": 1}, make_metadata())
+        second = self.manager.save_model({"n": 2}, make_metadata())
+
+        assert first.endswith("_001")
+        assert second.endswith("_002")
+
+    def test_set_production_model(self):
+        """Test that only one model is flagged as production"""
+        first = self.manager.save_model({"n": 1}, make_metadata())
+        second = self.manager.save_model({"n": 2}, make_metadata())
+
+        self.manager.set_production_model(first)
+        self.manager.set_production_model(second)
+
+        production = [m["version"] for m in self.manager.get_model_list() if m["is_production"]]
+        assert production == [second]
+
+    def test_set_production_model_unknown_version(self):
+        """Test that deploying an unknown version leaves production unchanged"""
+        version = self.manager.save_model({"n": 1}, make_metadata())
+        self.manager.set_production_model(version)
+
+        with pytest.raises(ValueError):
+            self.manager.set_production_model("v19700101_001")
+
+        production = [m["version"] for m in self.manager.get_model_list() if m["is_production"]]
+        assert production == [version]
+
+    def test_load_latest_active_model(self):
+        """Test that the active model is the one loaded"""
+        first = self.manager.save_model({"n": 1}, make_metadata())
+        self.manager.save_model({"n": 2}, make_metadata())
+
+        self.manager.set_active_model(first)
+
+        model, metadata = self.manager.load_latest_model()
+        assert metadata.version == first
+        assert model == {"n": 1}
+
+    def test_latest_model_link_follows_active_model(self):
+        """Test that latest_model.pkl is swapped to the activated version"""
+        first = self.manager.save_model({"n": 1}, make_metadata())
+        self.manager.save_model({"n": 2}, make_metadata())
+
+        self.manager.set_active_model(first)
+
+        models_dir = os.path.join(self.tmp_dir, "models")
+        assert os.readlink(os.path.join(models_dir, "latest_model.pkl")) == f"model_{first}.pkl"
+        assert not [name for name in os.listdir(models_dir) if name.endswith(".tmp")]
+
+    def test_rollback_moves_link_after_commit(self):
+        """Test that a rollback activates the version and then swaps latest_model.pkl"""
+        first = self.manager.save_model({"n": 1}, make_metadata())
+        second = self.manager.save_model({"n": 2}, make_metadata())
+        self.manager.set_production_model(second)
+
+        self.manager.rollback_to_version(first)
+
+        models_dir = os.path.join(self.tmp_dir, "models")
+        assert os.readlink(os.path.join(models_dir, "latest_model.pkl")) == f"model_{first}.pkl"
+        production = [m["version"] for m in self.manager.get_model_list() if m["is_production"]]
+        assert production == [first]
+
+    def test_unknown_version_rolls_back(self):
+        """Test that a failed deployment leaves no partial writes behind"""
+        version = self.manager.save_model({"n": 1}, make_metadata())
+        self.manager.set_active_model(version)
+
+        with pytest.raises(ValueError):
+            self.manager.set_active_model("v19700101_001")
+
+        active = [m["version"] for m in self.manager.get_model_list() if m["is_active"]]
+        assert active == [version]
+
+    def test_cleanup_old_models(self):
+        """Test that pruned models lose their files and metadata rows"""
+        versions = [self.manager.save_model({"n": i}, make_metadata()) for i in range(4)]
+        self.manager.set_active_model(versions[0])
+
+        # Saves within one second share created_at; spread them out
+        for i, version in enumerate(versions):
+            self.manager._conn.execute(
+                "UPDATE model_metadata SET created_at = datetime('now', ?) WHERE version = ?",
+                (f"-{len(versions) - i} minutes", version)
+            )
+
+        self.manager.cleanup_old_models(keep_count=2)
+
+        remaining = {m["version"] for m in self.manager.get_model_list()}
+        assert len(remaining) == 3
+        assert versions[0] in remaining
+
+        for version in set(versions) - remaining:
+            assert not os.path.exists(os.path.join(self.tmp_dir, "models", f"model_{version}.pkl"))
+            assert self.manager.get_performance_history(version) == []
+
+    def test_reads_refresh_after_writes(self):
+        """Test that cached reads reflect later writes"""
+        version = self.manager.save_model({"n": 1}, make_metadata())
+        assert self.manager.get_performance_history(version) == []
+
+        self.manager.record_performance_metric(version, "prediction_time", 0.01)
+
+        history = self.manager.get_performance_history(version)
+        assert [entry["metric_name"] for entry in history] == ["prediction_time"]
+        assert self.manager.get_model_list() is self.manager.get_model_list()
+
+    def test_concurrent_metric_recording(self):
+        """Test that threads can share the manager's connection"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        version = self.manager.save_model({"n": 1}, make_metadata())
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(
+                lambda i: self.manager.record_performance_metric(version, "latency", float(i)),
+                range(200)
+            ))
+
+        assert len(self.manager.get_performance_history(version)) == 200
+
+    def test_save_model_async(self):
+        """Test that background saves get distinct versions and complete"""
+        futures = [self.manager.save_model_async({"n": i}, make_metadata()) for i in range(3)]
+        versions = [future.result() for future in futures]
+
+        assert len(set(versions)) == 3
+        model, _ = self.manager.load_model_by_version(versions[2])
+        assert model == {"n": 2}
+        assert not [name for name in os.listdir(os.path.join(self.tmp_dir, "models")) if name.endswith(".tmp")]
+
+    def test_unchanged_active_model_is_not_reloaded(self):
+        """Test that deployment bookkeeping keeps the loaded model"""
+        version = self.manager.save_model({"n": 1}, make_metadata())
+        self.manager.set_active_model(version)
+        model, _ = self.manager.load_latest_model()
+
+        self.manager.set_production_model(version)
+        self.manager.record_performance_metric(version, "accuracy", 0.9)
+
+        reloaded, metadata = self.manager.load_latest_model()
+        assert reloaded is model
+        assert metadata.is_production
+
+    def test_metrics_are_buffered_until_flush(self):
+        """Test that recorded metrics reach the database in a batch"""
+        # Keep the background flush from writing the metrics early
+        self.manager.close()
+        self.manager = ModelManager(
+            models_dir=os.path.join(self.tmp_dir, "models"),
+            metadata_db=os.path.join(self.tmp_dir, "data", "model_metadata.db"),
+            metric_flush_interval=3600
+        )
+        version = self.manager.save_model({"n": 1}, make_metadata())
+        count = "SELECT COUNT(*) FROM model_performance"
+
+        for i in range(5):
+            self.manager.record_performance_metric(version, "latency", float(i))
+        pending = self.manager._conn.execute(count).fetchone()[0]
+
+        self.manager.flush_metrics()
+        assert pending == 0
+        assert self.manager._conn.execute(count).fetchone()[0] == 5
@@ -0,0 +1,104 @@
+import pytest
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(__file__))
+
+import scoring_monitor
+from scoring_monitor import ScoringMonitor, ScoringEvent
+from partner_dashboard_api import PartnerDashboardManager, ScoreFilter, UserApprovalRequest
+
+def make_event(user_id: str, credit_score: float, timestamp: float = None) -> ScoringEvent:
+    """Build a successful scoring event for a user"""
+    return ScoringEvent(
+        timestamp=timestamp if timestamp is not None else time.time(),
+        user_id=user_id,
+        api_key="k1",
+        request_data={"age": 30, "income": 1000, "region": "nairobi"},
+        response_data={"credit_score": credit_score, "score_range": "Fair", "model_version": "v1"},
+        processing_time=0.01,
+        ip_address="127.0.0.1",
+        user_agent="tests",
+        status_code=200
+    )
+
+class TestPartnerDashboard:
+    """Test suite for partner dashboard scores, approvals and stats"""
+
+    def setup_method(self):
+        """Setup a monitor and dashboard on fresh databases"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.monitor = ScoringMonitor(
+            db_path=os.path.join(self.tmp_dir, "data", "scoring_monitor.db"),
+            alert_threshold=10_000
+        )
+        scoring_monitor._monitor_instance = self.monitor
+        self.manager = PartnerDashboardManager(os.path.join(self.tmp_dir, "data", "partner_dashboard.db"))
+
+        self.monitor.log_scoring_events([
+            make_event("alice", 600, time.time() - 3),
+            make_event("bob", 700, time.time() - 2),
+            make_event("carol", 520, time.time() - 1)
+        ])
+
+    def teardown_method(self):
+        """Remove the temporary databases"""
+        scoring_monitor._monitor_instance = None
+        shutil.rmtree(self.tmp_dir)
+
+    def partner_stats(self, partner_id: str):
+        """Read a partner's stats row for today"""
+        with sqlite3.connect(self.manager.db_path) as conn:
+            return conn.execute("""
+                SELECT total_scores, total_approvals, total_rejections, avg_score, total_credit_issued
+                FROM partner_stats WHERE partner_id = ? AND date = ?
+            """, (partner_id, datetime.now().date().isoformat())).fetchone()
+
+    def test_approvals_on_same_day_keep_running_average(self):
+        """Test that repeated decisions on one day update a single stats row"""
+        self.manager.approve_user("alice", "p1", UserApprovalRequest(user_id="alice", decision="approve", credit_limit=100.0), "tester")
+        self.manager.approve_user("bob", "p1", UserApprovalRequest(user_id="bob", decision="reject"), "tester")
+        self.manager.approve_user("carol", "p1", UserApprovalRequest(user_id="carol", decision="approve", credit_limit=300.0), "tester")
+
+        total_scores, approvals, rejections, avg_score, credit_issued = self.partner_stats("p1")
+        assert (total_scores, approvals, rejections, credit_issued) == (3, 2, 1, 400.0)
+        assert avg_score == pytest.approx((600 + 700 + 520) / 3)
+        assert self.partner_stats("p2") is None
+
+    def test_score_range_filter(self):
+        """Test that score filters are inclusive bounds on the credit score"""
+        scores = self.manager.get_scores("p1", ScoreFilter(min_score=600, max_score=700))
+        assert sorted(score["credit_score"] for score in scores) == [600, 700]
+
+        scores = self.manager.get_scores("p1", ScoreFilter(max_score=599))
+        assert [score["user_id"] for score in scores] == ["carol"]
+
+        scores = self.manager.get_scores("p1", ScoreFilter())
+        assert [score["user_id"] for score in scores] == ["carol", "bob", "alice"]
+
+    def test_dashboard_stats(self):
+        """Test that score stats are summed from the monitor's daily totals"""
+        stats = self.manager.get_dashboard_stats("p1")
+
+        assert (stats.total_scores, stats.scores_today) == (3, 3)
+        assert stats.avg_score == pytest.approx((600 + 700 + 520) / 3)
+
+    def test_stats_cache_invalidated_by_approval(self):
+        """Test that cached stats are reused until the partner makes a decision"""
+        stats = self.manager.get_dashboard_stats("p1")
+        other = self.manager.get_dashboard_stats("p2")
+        assert self.manager.get_dashboard_stats("p1") is stats
+        assert stats.active_users == 0
+
+        self.manager.approve_user("alice", "p1", UserApprovalRequest(user_id="alice", decision="approve", credit_limit=100.0), "tester")
+
+        refreshed = self.manager.get_dashboard_stats("p1")
+        assert refreshed is not stats
+        assert (refreshed.active_users, refreshed.approval_rate) == (1, 100.0)
+        assert self.manager.get_dashboard_stats("p2") is other
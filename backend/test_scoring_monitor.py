@@ -0,0 +1,183 @@
+import pytest
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+import orjson
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Import the backend as a package; monitor_endpoints uses relative imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend import scoring_monitor
+from backend import monitor_endpoints
+from backend.auth import get_current_user
+from backend.scoring_monitor import ScoringMonitor, ScoringEvent
+
+def make_event(timestamp: float, user_id: str = "u1", api_key: str = "k1",
+               status_code: int = 200, credit_score: float = 600) -> ScoringEvent:
+    """Build a scoring event with a fixed request"""
+    return ScoringEvent(
+        timestamp=timestamp,
+        user_id=user_id,
+        api_key=api_key,
+        request_data={"age": 30},
+        response_data={"credit_score": credit_score} if credit_score is not None else {},
+        processing_time=0.01,
+        ip_address="127.0.0.1",
+        user_agent="tests",
+        status_code=status_code
+    )
+
+class TestScoringMonitor:
+    """Test suite for the monitor's rollups and dashboard queries"""
+
+    def setup_method(self):
+        """Setup a monitor on a fresh database behind the monitor router"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "data", "scoring_monitor.db")
+        self.monitor = ScoringMonitor(db_path=self.db_path, alert_threshold=10_000)
+        scoring_monitor._monitor_instance = self.monitor
+        monitor_endpoints.invalidate_response_cache()
+
+        app = FastAPI()
+        app.include_router(monitor_endpoints.monitor_router)
+        app.dependency_overrides[get_current_user] = lambda: {"permissions": frozenset({"monitor", "admin"})}
+        self.client = TestClient(app)
+
+        # Three completed hours followed by the current, live hour
+        self.first_hour = (int(time.time() // 3600) - 3) * 3600
+
+    def teardown_method(self):
+        """Remove the temporary monitor database"""
+        scoring_monitor._monitor_instance = None
+        monitor_endpoints.invalidate_response_cache()
+        shutil.rmtree(self.tmp_dir)
+
+    def query(self, sql: str, params=()):
+        """Run a query against the monitor database"""
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def test_rollup_counts_completed_hours(self):
+        """Test that the rollup aggregates finished hours only and can be rerun"""
+        self.monitor.log_scoring_events([
+            make_event(self.first_hour + 60, api_key="k1"),
+            make_event(self.first_hour + 120, api_key="k1", status_code=500),
+            make_event(self.first_hour + 3600 + 60, api_key="k2"),
+            make_event(time.time(), api_key="k1")
+        ])
+
+        self.monitor.rollup_hourly()
+        self.monitor.rollup_hourly()
+
+        first_bucket = self.first_hour // 3600
+        assert self.query("SELECT * FROM hourly_stats ORDER BY hour_bucket, api_key") == [
+            (first_bucket, "k1", 2, 1),
+            (first_bucket + 1, "k2", 1, 0)
+        ]
+
+    def test_hourly_counts_merge_rollup_and_live_events(self):
+        """Test that dashboard hours combine rolled up hours with newer raw events"""
+        self.monitor.log_scoring_events([
+            make_event(self.first_hour + 60),
+            make_event(self.first_hour + 3600 + 60, status_code=500)
+        ])
+        self.monitor.rollup_hourly()
+        self.monitor.log_scoring_events([make_event(time.time()), make_event(time.time())])
+
+        charts = self.client.get("/monitor/dashboard-data").json()["charts"]
+
+        start_bucket = int((time.time() - 24 * 3600) // 3600)
+        offset = self.first_hour // 3600 - start_bucket
+        assert charts["hourly_requests"] == [
+            {"hour": offset, "requests": 1},
+            {"hour": offset + 1, "requests": 1},
+            {"hour": offset + 3, "requests": 2}
+        ]
+        assert charts["hourly_errors"] == [{"hour": offset + 1, "errors": 1}]
+
+    def test_top_api_keys(self):
+        """Test that top API keys add live events to the rolled up counts"""
+        self.monitor.log_scoring_events(
+            [make_event(self.first_hour + 60, api_key="k1")] * 3 +
+            [make_event(self.first_hour + 60, api_key="k2")]
+        )
+        self.monitor.rollup_hourly()
+        self.monitor.log_scoring_events([make_event(time.time(), api_key="k2")] * 4)
+
+        charts = self.client.get("/monitor/dashboard-data").json()["charts"]
+
+        assert charts["top_api_keys"] == [
+            {"api_key": "k2", "requests": 5},
+            {"api_key": "k1", "requests": 3}
+        ]
+
+    def test_events_are_streamed_newest_first(self):
+        """Test that /events streams every matching event as NDJSON across fetch batches"""
+        count = monitor_endpoints.EVENTS_FETCH_SIZE + 50
+        self.monitor.log_scoring_events([
+            make_event(self.first_hour + i, user_id=f"u{i % 2}") for i in range(count)
+        ])
+
+        response = self.client.get("/monitor/events", params={"limit": 1000})
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [orjson.loads(line) for line in response.text.splitlines()]
+        assert len(events) == count
+        assert [event["timestamp"] for event in events] == sorted(
+            (event["timestamp"] for event in events), reverse=True
+        )
+        assert events[0]["response_data"] == {"credit_score": 600}
+        assert events[0]["created_at_iso"].startswith(
+            time.strftime("%Y-%m-%dT%H", time.localtime(events[0]["timestamp"]))
+        )
+
+    def test_events_filters(self):
+        """Test that /events applies each filter that is given"""
+        self.monitor.log_scoring_events([
+            make_event(self.first_hour + 10, user_id="u1", api_key="k1"),
+            make_event(self.first_hour + 20, user_id="u1", api_key="k2"),
+            make_event(self.first_hour + 30, user_id="u2", api_key="k2")
+        ])
+
+        def timestamps(**params):
+            response = self.client.get("/monitor/events", params=params)
+            return [orjson.loads(line)["timestamp"] for line in response.text.splitlines()]
+
+        assert timestamps(user_id="u1") == [self.first_hour + 20, self.first_hour + 10]
+        assert timestamps(api_key="k2", start_time=self.first_hour + 25) == [self.first_hour + 30]
+        assert timestamps(user_id="u1", end_time=self.first_hour + 15) == [self.first_hour + 10]
+        assert timestamps(limit=1) == [self.first_hour + 30]
+
+    def test_malformed_event_json_is_streamed_as_text(self):
+        """Test that a row with invalid JSON does not end the stream"""
+        self.monitor.log_scoring_events([make_event(self.first_hour + 10)])
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE scoring_events SET response_data = CAST('{bad' AS BLOB)")
+
+        lines = self.client.get("/monitor/events").text.splitlines()
+
+        assert len(lines) == 1
+        assert orjson.loads(lines[0])["response_data"] == "{bad"
+
+    def test_daily_scores_track_events(self):
+        """Test that daily totals are kept on write and backfilled for a new table"""
+        day = time.strftime("%Y-%m-%d", time.localtime(self.first_hour + 60))
+        self.monitor.log_scoring_events([
+            make_event(self.first_hour + 60, credit_score=500),
+            make_event(self.first_hour + 60, credit_score=700),
+            make_event(self.first_hour + 60, credit_score=None)
+        ])
+        expected = [(day, 3, 2, 1200.0)]
+        assert self.query("SELECT * FROM daily_scores WHERE day = ?", (day,)) == expected
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DROP TABLE daily_scores")
+        ScoringMonitor(db_path=self.db_path)
+
+        assert self.query("SELECT * FROM daily_scores WHERE day = ?", (day,)) == expected